@@ -1,3 +1,10 @@
-from app.main import app
+from app.core.lazy import lazy_exports
 
-__all__ = ["app"]
+_EXPORTS = {
+    "app": "app.main",
+    "create_app": "app.main"
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
@@ -1,13 +1,23 @@
-from app.core.config import get_settings, Settings
-from app.core.database import get_db_session, init_database, Base
-from app.core.auth import get_current_user_optional, get_current_user_required
+from app.core.lazy import lazy_exports
 
-__all__ = [
-    "get_settings",
-    "Settings",
-    "get_db_session",
-    "init_database",
-    "Base",
-    "get_current_user_optional",
-    "get_current_user_required"
-]
+_EXPORTS = {
+    "get_settings": "app.core.config",
+    "use_settings": "app.core.config",
+    "Settings": "app.core.config",
+    "get_db_session": "app.core.database",
+    "get_read_session": "app.core.database",
+    "init_database": "app.core.database",
+    "dialect_insert": "app.core.database",
+    "Base": "app.core.database",
+    "get_http_client": "app.core.http",
+    "http_pool": "app.core.http",
+    "UserIdentity": "app.core.identity",
+    "invalidate_user": "app.core.identity",
+    "get_current_user_optional": "app.core.auth",
+    "get_current_user_required": "app.core.auth",
+    "get_current_admin_required": "app.core.auth"
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
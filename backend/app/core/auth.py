@@ -1,49 +1,103 @@
-import httpx
+import hashlib
+import time
+from collections import OrderedDict
 from fastapi import HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
 from typing import Optional
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.core.config import get_settings
-from app.core.database import get_db_session
-from app.models.user import User
+from app.core.config import Settings
+from app.core.identity import UserIdentity, get_or_create_identity, identity_cache
+from app.core.jwks import JWKSManager
 
-settings = get_settings()
 security = HTTPBearer(auto_error=False)
 
-_jwks_cache: dict = {}
 
+class VerifiedClaimsCache:
+    """Bounded LRU of verified JWT claims keyed by the SHA-256 of the token.
 
-async def get_clerk_jwks() -> dict:
-    global _jwks_cache
-    if _jwks_cache:
-        return _jwks_cache
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(settings.clerk_jwks_url)
-        if response.status_code == 200:
-            _jwks_cache = response.json()
-            return _jwks_cache
-    return {}
+    Entries expire at the token's ``exp`` claim; tokens without one are
+    never cached.
+    """
 
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0}
 
-async def verify_clerk_token(token: str) -> Optional[dict]:
-    try:
-        jwks = await get_clerk_jwks()
-        if not jwks.get("keys"):
+    def get(self, token: str) -> Optional[dict]:
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        if entry is None:
+            self.counters["misses"] += 1
             return None
         
-        unverified_header = jwt.get_unverified_header(token)
-        kid = unverified_header.get("kid")
+        expires_at, claims = entry
+        if time.time() >= expires_at:
+            del self._entries[digest]
+            self.counters["expired"] += 1
+            self.counters["misses"] += 1
+            return None
         
-        rsa_key = None
-        for key in jwks["keys"]:
-            if key.get("kid") == kid:
-                rsa_key = key
-                break
+        self._entries.move_to_end(digest)
+        self.counters["hits"] += 1
+        return claims
+
+    def put(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_size <= 0:
+            return
         
+        digest = token_digest(token)
+        self._entries[digest] = (float(exp), claims)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "size": len(self._entries),
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0
+        }
+
+
+def token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+claims_cache = VerifiedClaimsCache()
+
+jwks_manager = JWKSManager(on_keys_removed=claims_cache.clear)
+
+
+def configure_auth(settings: Settings) -> None:
+    if jwks_manager.url != settings.clerk_jwks_url:
+        jwks_manager.reset()
+        claims_cache.clear()
+        identity_cache.invalidate()
+    jwks_manager.url = settings.clerk_jwks_url
+    jwks_manager.ttl = settings.jwks_cache_ttl
+    jwks_manager.min_refresh_interval = settings.jwks_min_refresh_interval
+    jwks_manager.failure_ttl = settings.jwks_failure_ttl
+    claims_cache.max_size = settings.auth_claims_cache_size
+    identity_cache.max_size = settings.identity_cache_size
+    identity_cache.ttl = settings.identity_cache_ttl
+
+
+async def verify_clerk_token(token: str) -> Optional[dict]:
+    cached = claims_cache.get(token)
+    if cached is not None:
+        return cached
+    
+    try:
+        unverified_header = jwt.get_unverified_header(token)
+        rsa_key = await jwks_manager.get_key(unverified_header.get("kid"))
         if not rsa_key:
             return None
         
@@ -53,16 +107,17 @@ async def verify_clerk_token(token: str) -> Optional[dict]:
             algorithms=["RS256"],
             options={"verify_aud": False}
         )
-        return payload
     except JWTError:
         return None
+    
+    claims_cache.put(token, payload)
+    return payload
 
 
 async def get_current_user_optional(
     request: Request,
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db_session: AsyncSession = Depends(get_db_session)
-) -> Optional[User]:
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> Optional[UserIdentity]:
     if not credentials:
         return None
     
@@ -70,34 +125,29 @@ async def get_current_user_optional(
     if not payload:
         return None
     
-    clerk_user_id = payload.get("sub")
-    if not clerk_user_id:
+    if not payload.get("sub"):
         return None
     
-    result = await db_session.execute(
-        select(User).where(User.clerk_id == clerk_user_id)
-    )
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        user = User(
-            clerk_id=clerk_user_id,
-            email=payload.get("email", ""),
-            name=payload.get("name", payload.get("first_name", "User"))
-        )
-        db_session.add(user)
-        await db_session.flush()
-        await db_session.refresh(user)
-    
-    return user
+    return await get_or_create_identity(payload)
 
 
 async def get_current_user_required(
-    user: Optional[User] = Depends(get_current_user_optional)
-) -> User:
+    user: Optional[UserIdentity] = Depends(get_current_user_optional)
+) -> UserIdentity:
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication required. Please sign in to continue."
         )
     return user
+
+
+async def get_current_admin_required(
+    user: UserIdentity = Depends(get_current_user_required)
+) -> UserIdentity:
+    if not user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required."
+        )
+    return user
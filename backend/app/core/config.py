@@ -1,4 +1,3 @@
-from functools import lru_cache
 from typing import Optional, Union
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -7,17 +6,69 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     app_name: str = "Ashish Gupta Portfolio API"
     app_version: str = "1.0.0"
-    debug: bool = True
+    debug: bool = False
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_rate_limit_per_second: float = 100.0
+    log_rate_limit_burst: int = 200
+    log_sample_rates: dict[str, float] = {}
+    sql_log_sample_rate: float = 0.0
+    metrics_enabled: bool = False
+    metrics_token: str = ""
+    query_profiler: bool = False
+    slow_query_threshold_ms: float = 100.0
+    slow_query_log_params: bool = False
+    query_budget_enforce: bool = False
     
     
     database_url: str = "sqlite+aiosqlite:///./portfolio.db"
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_replica_url: str = ""
+    database_replica_pool_size: int = 10
+    database_replica_max_overflow: int = 10
+    database_replica_check_interval: float = 10.0
+    sqlite_tuning: bool = True
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size: int = 268435456
+    sqlite_cache_size_kib: int = 65536
+    sqlite_read_pool_size: int = 8
+    sqlite_writer_timeout: float = 30.0
     
     clerk_secret_key: str = ""
     clerk_publishable_key: str = ""
     clerk_jwks_url: str = ""
+    auth_claims_cache_size: int = 10000
+    jwks_cache_ttl: int = 3600
+    jwks_min_refresh_interval: int = 30
+    jwks_failure_ttl: int = 10
+    identity_cache_size: int = 10000
+    identity_cache_ttl: int = 300
     github_username: str = "Aashish-Op"
     github_token: Optional[str] = None
     github_api_base: str = "https://api.github.com"
+    github_cache_ttl: int = 300
+    github_cache_max_stale: int = 3600
+    github_languages_concurrency: int = 8
+    project_sync_interval: int = 600
+    
+    visit_buffer_max_size: int = 10000
+    visit_buffer_batch_size: int = 500
+    visit_buffer_flush_interval: float = 1.0
+    visit_buffer_overflow: str = "drop_newest"
+    visit_buffer_max_retries: int = 5
+    visit_buffer_retry_backoff: float = 0.5
+    visitor_reconcile_interval: int = 3600
+    
+    fast_json_responses: bool = False
+    fast_json_cache_ttl: float = 5.0
+    
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 5.0
+    http2_enabled: bool = False
     
     cors_origins: Union[str, list[str]] = "http://localhost:5173,http://localhost:3000,https://ashishgupta.dev"
     
@@ -33,7 +84,20 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
-@lru_cache()
+_settings: Optional[Settings] = None
+
+
 def get_settings() -> Settings:
-    return Settings()
+    # Read from the environment on first use, not at import, so that
+    # ``create_app(settings)`` can install its own before anything asks.
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
+
+
+def use_settings(settings: Settings) -> Settings:
+    global _settings
+    _settings = settings
+    return settings
 
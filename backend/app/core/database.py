@@ -1,29 +1,156 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from app.core.config import get_settings
-
-settings = get_settings()
-
-is_sqlite = settings.database_url.startswith("sqlite")
-
-if is_sqlite:
-    async_engine = create_async_engine(
-        settings.database_url,
-        echo=settings.debug,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    async_engine = create_async_engine(
-        settings.database_url,
-        echo=settings.debug,
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import AsyncGenerator, Callable, Optional
+from sqlalchemy import Connection, String, event, inspect, literal, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import InterfaceError, InvalidRequestError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from app.core.config import Settings, get_settings
+from app.core.metrics import instrument_engine, timed_pool_class
+from app.core.profiler import profile_engine, query_profiler_enabled
+
+logger = logging.getLogger(__name__)
+
+
+def is_sqlite(settings: Optional[Settings] = None) -> bool:
+    return (settings or get_settings()).database_url.startswith("sqlite")
+
+
+def apply_sqlite_pragmas(dbapi_connection, settings: Settings, query_only: bool = False) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+    if query_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def tune_sqlite_engine(engine: AsyncEngine, settings: Settings, query_only: bool = False) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _tune_connection(dbapi_connection, connection_record) -> None:
+        apply_sqlite_pragmas(dbapi_connection, settings, query_only=query_only)
+
+
+class DatabaseEngines:
+    """The primary, read and optional replica engines for one ``Settings``.
+
+    Built by ``init_engines`` when the app starts (or on the first session
+    outside an app), never at import.
+    """
+
+    def __init__(self, settings: Settings):
+        self.is_sqlite = is_sqlite(settings)
+        is_sqlite_file = self.is_sqlite and ":memory:" not in settings.database_url
+
+        if is_sqlite_file and settings.sqlite_tuning:
+            # SQLite allows one writer at a time. Every write session shares a single
+            # connection, so in-process writers queue on the pool instead of failing
+            # with "database is locked"; WAL lets the read pool keep reading meanwhile.
+            self.primary = create_async_engine(
+                settings.database_url,
+                connect_args={"check_same_thread": False},
+                poolclass=timed_pool_class("primary"),
+                pool_size=1,
+                max_overflow=0,
+                pool_timeout=settings.sqlite_writer_timeout
+            )
+            self.read = create_async_engine(
+                settings.database_url,
+                connect_args={"check_same_thread": False},
+                poolclass=timed_pool_class("read"),
+                pool_size=settings.sqlite_read_pool_size,
+                max_overflow=0
+            )
+            tune_sqlite_engine(self.primary, settings)
+            tune_sqlite_engine(self.read, settings, query_only=True)
+        elif self.is_sqlite:
+            self.primary = create_async_engine(
+                settings.database_url,
+                connect_args={"check_same_thread": False}
+            )
+            self.read = self.primary
+        else:
+            self.primary = create_async_engine(
+                settings.database_url,
+                pool_pre_ping=True,
+                poolclass=timed_pool_class("primary"),
+                pool_size=settings.database_pool_size,
+                max_overflow=settings.database_max_overflow
+            )
+            # Read sessions run as READ ONLY transactions.
+            self.read = self.primary.execution_options(postgresql_readonly=True)
+
+        self.replica = (
+            create_replica_engine(settings.database_replica_url, settings)
+            if settings.database_replica_url else None
+        )
+
+        for name, sync_engine in self.pooled_engines().items():
+            if settings.metrics_enabled:
+                instrument_engine(sync_engine, name)
+            if query_profiler_enabled(settings):
+                profile_engine(sync_engine)
+
+    def pooled_engines(self) -> dict:
+        """One sync engine per connection pool, keyed by role.
+
+        On Postgres ``read`` is an option engine of ``primary``: it shares the
+        pool, and events registered on ``primary`` already fire for it, so
+        listening on both would time and profile every read query twice.
+        """
+        engines = {"primary": self.primary.sync_engine}
+        if self.read.sync_engine.pool is not self.primary.sync_engine.pool:
+            engines["read"] = self.read.sync_engine
+        if self.replica is not None:
+            engines["replica"] = self.replica.sync_engine
+        return engines
+
+    async def dispose(self) -> None:
+        await self.primary.dispose()
+        if "read" in self.pooled_engines():
+            await self.read.dispose()
+        if self.replica is not None:
+            await self.replica.dispose()
+
+
+def create_replica_engine(url: str, settings: Settings) -> AsyncEngine:
+    if url.startswith("sqlite"):
+        engine = create_async_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            poolclass=timed_pool_class("replica"),
+            pool_size=settings.database_replica_pool_size,
+            max_overflow=settings.database_replica_max_overflow
+        )
+        tune_sqlite_engine(engine, settings, query_only=True)
+        return engine
+
+    return create_async_engine(
+        url,
         pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=10
-    )
+        poolclass=timed_pool_class("replica"),
+        pool_size=settings.database_replica_pool_size,
+        max_overflow=settings.database_replica_max_overflow
+    ).execution_options(postgresql_readonly=True)
 
-AsyncSessionLocal = async_sessionmaker(
-    bind=async_engine,
+
+class LazySessionMaker(async_sessionmaker):
+    """``async_sessionmaker`` that builds the engines on first use if nothing has yet."""
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            init_engines()
+        return super().__call__(**local_kw)
+
+
+AsyncSessionLocal = LazySessionMaker(
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -31,23 +158,227 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+class ReadOnlySession(Session):
+    """Sync session behind ``ReadSessionLocal``; refuses to flush pending changes."""
+
+
+@event.listens_for(ReadOnlySession, "before_flush")
+def _reject_read_only_flush(session, flush_context, instances) -> None:
+    raise InvalidRequestError("Read-only session cannot flush changes")
+
+
+ReadSessionLocal = LazySessionMaker(
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+ReplicaSessionLocal = LazySessionMaker(
+    class_=AsyncSession,
+    sync_session_class=ReadOnlySession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
+_engines: Optional[DatabaseEngines] = None
+
+
+def init_engines(settings: Optional[Settings] = None) -> DatabaseEngines:
+    global _engines
+    if _engines is None:
+        settings = settings or get_settings()
+        _engines = DatabaseEngines(settings)
+        AsyncSessionLocal.configure(bind=_engines.primary)
+        ReadSessionLocal.configure(bind=_engines.read)
+        ReplicaSessionLocal.configure(bind=_engines.replica or _engines.read)
+        replica_health.retry_interval = settings.database_replica_check_interval
+    return _engines
+
+
+def get_engines() -> DatabaseEngines:
+    return _engines if _engines is not None else init_engines()
+
+
+class ReplicaHealth:
+    """Tracks whether read sessions may use the replica.
+
+    A connection error on the replica, or a failed background probe, sends
+    reads to the primary for ``retry_interval`` seconds; a successful probe
+    restores the replica straight away.
+    """
+
+    def __init__(self, retry_interval: float = 10.0):
+        self.retry_interval = retry_interval
+        self._unhealthy_until = 0.0
+        self.counters = {"replica_sessions": 0, "primary_fallbacks": 0, "failures": 0}
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self._unhealthy_until
+
+    def record_failure(self, error: Exception) -> None:
+        self.counters["failures"] += 1
+        if self.healthy:
+            logger.warning("Read replica unavailable, falling back to primary: %s", error)
+        self._unhealthy_until = time.monotonic() + self.retry_interval
+
+    def record_success(self) -> None:
+        if not self.healthy:
+            logger.info("Read replica healthy again")
+        self._unhealthy_until = 0.0
+
+    def stats(self) -> dict:
+        configured = _engines is not None and _engines.replica is not None
+        return {**self.counters, "configured": configured, "healthy": self.healthy}
+
+
+replica_health = ReplicaHealth()
+
+
+def use_replica() -> bool:
+    if get_engines().replica is None:
+        return False
+    if replica_health.healthy:
+        replica_health.counters["replica_sessions"] += 1
+        return True
+    replica_health.counters["primary_fallbacks"] += 1
+    return False
+
+
+def open_read_session() -> AsyncSession:
+    return ReplicaSessionLocal() if use_replica() else ReadSessionLocal()
+
+
 class Base(DeclarativeBase):
     pass
 
 
+def dialect_insert(model):
+    if is_sqlite():
+        return sqlite.insert(model)
+    return postgresql.insert(model)
+
+
+def datetime_bound(value: datetime):
+    """``value`` as a bound for comparing against a stored ``DateTime`` column.
+
+    SQLite keeps timestamps as text, and ``server_default`` ones have no
+    fractional seconds, so whole-second bounds are compared in that same
+    textual form; a bound with microseconds keeps them.
+    """
+    if is_sqlite():
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+        return literal(value.strftime(fmt), String)
+    return value
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
+    # Sessions only check out a connection on first use, so a request that
+    # never touches the database never begins, commits or rolls back.
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
+            if session.in_transaction():
+                await session.commit()
         except Exception:
-            await session.rollback()
+            if session.in_transaction():
+                await session.rollback()
+            raise
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    # Closing the session ends its transaction; there is nothing to commit.
+    on_replica = use_replica()
+    async with (ReplicaSessionLocal if on_replica else ReadSessionLocal)() as session:
+        try:
+            yield session
+        except (OperationalError, InterfaceError) as e:
+            if on_replica:
+                replica_health.record_failure(e)
             raise
-        finally:
-            await session.close()
 
 
-async def init_database() -> None:
-    async with async_engine.begin() as conn:
+async def check_replica() -> bool:
+    replica_engine = get_engines().replica
+    if replica_engine is None:
+        return False
+    try:
+        async with replica_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    except (OSError, OperationalError, InterfaceError) as e:
+        replica_health.record_failure(e)
+        return False
+    replica_health.record_success()
+    return True
+
+
+async def replica_health_loop(interval: float) -> None:
+    while True:
+        await check_replica()
+        await asyncio.sleep(interval)
+
+
+def upgrade_schema(
+    connection: Connection,
+    backfills: Optional[dict[str, Callable[[Connection], None]]] = None
+) -> list[str]:
+    """Add columns and indexes that existing tables are missing.
+
+    ``create_all`` skips tables that already exist, so a database created by
+    an earlier release never gets columns or indexes added to its models
+    since. Only additive changes are applied: new nullable columns and new
+    indexes. ``backfills`` maps ``"table.column"`` to a function that fills
+    that column in the same transaction right after it is added.
+    """
+    inspector = inspect(connection)
+    preparer = connection.dialect.identifier_preparer
+    applied = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"Cannot add NOT NULL column {table.name}.{column.name} without a server default"
+                )
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}"))
+            applied.append(f"{table.name}.{column.name}")
+            backfill = (backfills or {}).get(f"{table.name}.{column.name}")
+            if backfill is not None:
+                backfill(connection)
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+                applied.append(index.name)
+    return applied
+
+
+async def init_database(
+    backfills: Optional[dict[str, Callable[[Connection], None]]] = None
+) -> list[str]:
+    async with get_engines().primary.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        applied = await conn.run_sync(upgrade_schema, backfills)
+    if applied:
+        logger.info("Upgraded database schema: %s", ", ".join(applied))
+    return applied
+
+
+async def dispose_engines() -> None:
+    global _engines
+    if _engines is None:
+        return
+
+    engines, _engines = _engines, None
+    for session_factory in (AsyncSessionLocal, ReadSessionLocal, ReplicaSessionLocal):
+        session_factory.configure(bind=None)
+    await engines.dispose()
 
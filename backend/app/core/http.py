@@ -0,0 +1,101 @@
+import importlib.util
+import logging
+import weakref
+from typing import Optional
+
+import httpx
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClientPool:
+    """Application-scoped ``httpx.AsyncClient`` shared by all outbound calls.
+
+    Created in the ``lifespan`` hook and closed on shutdown. Calls made
+    outside the app (scripts, one-off jobs) get a client lazily.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._streams: weakref.WeakSet = weakref.WeakSet()
+        self.counters = {
+            "requests": 0,
+            "responses": 0,
+            "connections_opened": 0
+        }
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        if self._client is None or self._client.is_closed or transport is not None:
+            await self.close()
+            self._client = self._build_client(transport)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> dict:
+        responses = self.counters["responses"]
+        reused = max(responses - self.counters["connections_opened"], 0)
+        return {
+            **self.counters,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / responses, 4) if responses else 0.0,
+            "open_connections": self._open_connections()
+        }
+
+    def _build_client(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+        settings = get_settings()
+        http2 = settings.http2_enabled
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+            http2 = False
+
+        return httpx.AsyncClient(
+            transport=transport,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry
+            ),
+            timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
+            event_hooks={
+                "request": [self._on_request],
+                "response": [self._on_response]
+            }
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.counters["requests"] += 1
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        self.counters["responses"] += 1
+        stream = response.extensions.get("network_stream")
+        if stream is None:
+            return
+        try:
+            if stream not in self._streams:
+                self._streams.add(stream)
+                self.counters["connections_opened"] += 1
+        except TypeError:
+            self.counters["connections_opened"] += 1
+
+    def _open_connections(self) -> int:
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        return len(getattr(pool, "connections", ()))
+
+
+http_pool = HttpClientPool()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    return http_pool.client
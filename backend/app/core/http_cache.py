@@ -0,0 +1,140 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Caching rules for one GET route.
+
+    ``version`` returns a data-version token; when set, the ETag is derived
+    from it. For ``public`` routes a matching ``If-None-Match`` is answered
+    with 304 before the route runs; private routes run first, so their
+    dependencies (auth, query budgets) still apply, and only the body is
+    skipped. Tokens only see writes made by this process, so the ETag
+    also changes every ``version_ttl`` seconds to bound how long a change
+    made elsewhere can go unnoticed. ``static`` routes hash the body of
+    their first 200 response and reuse that ETag for the life of the
+    process; their body must not depend on the query string, which is
+    ignored for them. Other routes hash every response body.
+    """
+
+    cache_control: str
+    version: Optional[Callable[[], str]] = None
+    version_ttl: float = 60.0
+    static: bool = False
+
+    @property
+    def public(self) -> bool:
+        return self.cache_control.startswith("public")
+
+
+def cache_control(max_age: int, stale_while_revalidate: int = 0, private: bool = False) -> str:
+    parts = ["private" if private else "public", f"max-age={max_age}"]
+    if stale_while_revalidate:
+        parts.append(f"stale-while-revalidate={stale_while_revalidate}")
+    return ", ".join(parts)
+
+
+def make_etag(*parts: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+
+class ConditionalGetMiddleware:
+    """Strong ETags, 304 Not Modified and Cache-Control for registered GET routes."""
+
+    def __init__(self, app: ASGIApp, policies: dict[str, CachePolicy]):
+        self.app = app
+        self.policies = policies
+        self._static_etags: dict[str, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        policy = self.policies.get(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = scope["path"] + "?" + scope.get("query_string", b"").decode("latin-1")
+        if_none_match = Headers(scope=scope).get("if-none-match")
+
+        known_etag = None
+        if policy.version is not None:
+            window = int(time.time() // policy.version_ttl)
+            known_etag = make_etag(key.encode(), policy.version().encode(), str(window).encode())
+        elif policy.static:
+            # Keyed by path alone, so the dict holds at most one entry per
+            # registered static route whatever query strings clients send.
+            known_etag = self._static_etags.get(scope["path"])
+
+        if policy.public and known_etag and etag_matches(if_none_match, known_etag):
+            await self._send_not_modified(send, known_etag, policy)
+            return
+
+        start_message: Optional[Message] = None
+        body_parts: list[bytes] = []
+        passthrough = False
+
+        async def buffered_send(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(body_parts)
+            etag = known_etag or make_etag(body)
+            if policy.static:
+                self._static_etags[scope["path"]] = etag
+
+            if etag_matches(if_none_match, etag):
+                await self._send_not_modified(send, etag, policy)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            headers["ETag"] = etag
+            headers["Cache-Control"] = policy.cache_control
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, buffered_send)
+
+    @staticmethod
+    async def _send_not_modified(send: Send, etag: str, policy: CachePolicy) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [
+                (b"etag", etag.encode()),
+                (b"cache-control", policy.cache_control.encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
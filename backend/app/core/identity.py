@@ -0,0 +1,129 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+
+from app.core.database import AsyncSessionLocal, dialect_insert, open_read_session
+from app.models.user import User
+
+IDENTITY_COLUMNS = (User.id, User.clerk_id, User.email, User.name, User.is_admin)
+
+
+@dataclass(frozen=True)
+class UserIdentity:
+    """The subset of a ``users`` row that request handlers need."""
+
+    id: int
+    clerk_id: str
+    email: str
+    name: str
+    is_admin: bool
+
+
+class IdentityCache:
+    """Bounded LRU of ``clerk_id`` -> ``UserIdentity`` entries that expire after ``ttl`` seconds.
+
+    Changes made through the ORM in this process invalidate entries right
+    away; the TTL bounds staleness from changes made anywhere else.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = 300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, UserIdentity]] = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, clerk_id: str) -> Optional[UserIdentity]:
+        entry = self._entries.get(clerk_id)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl:
+            self.counters["misses"] += 1
+            return None
+
+        self._entries.move_to_end(clerk_id)
+        self.counters["hits"] += 1
+        return entry[1]
+
+    def put(self, identity: UserIdentity) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._entries[identity.clerk_id] = (time.monotonic(), identity)
+        self._entries.move_to_end(identity.clerk_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, clerk_id: Optional[str] = None) -> None:
+        self.counters["invalidations"] += 1
+        if clerk_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(clerk_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["misses"]
+        return {
+            **self.counters,
+            "size": len(self._entries),
+            "hit_rate": round(self.counters["hits"] / lookups, 4) if lookups else 0.0
+        }
+
+
+identity_cache = IdentityCache()
+
+
+async def get_or_create_identity(claims: dict) -> UserIdentity:
+    clerk_id = claims["sub"]
+    identity = identity_cache.get(clerk_id)
+    if identity is not None:
+        return identity
+
+    async with open_read_session() as session:
+        result = await session.execute(
+            select(*IDENTITY_COLUMNS).where(User.clerk_id == clerk_id)
+        )
+        row = result.one_or_none()
+
+    if row is None:
+        async with AsyncSessionLocal() as session:
+            # Concurrent first requests for the same user race here; the
+            # loser's insert is a no-op and it reads the winner's row.
+            result = await session.execute(
+                dialect_insert(User)
+                .values(
+                    clerk_id=clerk_id,
+                    email=claims.get("email", ""),
+                    name=claims.get("name", claims.get("first_name", "User")),
+                    is_admin=False
+                )
+                .on_conflict_do_nothing(index_elements=[User.clerk_id])
+                .returning(*IDENTITY_COLUMNS)
+            )
+            row = result.one_or_none()
+            if row is None:
+                result = await session.execute(
+                    select(*IDENTITY_COLUMNS).where(User.clerk_id == clerk_id)
+                )
+                row = result.one()
+            await session.commit()
+
+    identity = UserIdentity(**row._mapping)
+    identity_cache.put(identity)
+    return identity
+
+
+def invalidate_user(clerk_id: Optional[str] = None) -> None:
+    identity_cache.invalidate(clerk_id)
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in ("is_admin", "email", "name")):
+        invalidate_user(target.clerk_id)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target: User) -> None:
+    invalidate_user(target.clerk_id)
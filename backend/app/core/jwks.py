@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+import httpx
+from jose import jwk, JOSEError
+from jose.backends.base import Key
+
+from app.core.http import get_http_client
+from app.core.metrics import observe_upstream
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSManager:
+    """Signing keys from a JWKS endpoint with TTL, kid-miss refresh and single-flight fetches.
+
+    A key set is reused for ``ttl`` seconds and kept past that if a refresh
+    fails. A token signed with an unknown ``kid`` forces a refresh, at most
+    once per ``min_refresh_interval``. Failed fetches are remembered for
+    ``failure_ttl`` seconds so callers do not hammer a struggling endpoint,
+    and concurrent callers share one in-flight request.
+    """
+
+    def __init__(
+        self,
+        url: str = "",
+        ttl: float = 3600,
+        min_refresh_interval: float = 30,
+        failure_ttl: float = 10,
+        on_keys_removed: Optional[Callable[[], None]] = None
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self.failure_ttl = failure_ttl
+        self._on_keys_removed = on_keys_removed
+        self.reset()
+        self.counters = {
+            "hits": 0,
+            "refreshes": 0,
+            "refresh_errors": 0,
+            "kid_misses": 0,
+            "coalesced": 0,
+            "negative_hits": 0
+        }
+
+    def reset(self) -> None:
+        self._jwks: dict = {}
+        self._keys: dict[str, Key] = {}
+        self._loaded_at: Optional[float] = None
+        self._fetched_at = 0.0
+        self._failed_until = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+
+    @property
+    def jwks(self) -> dict:
+        return self._jwks
+
+    async def get_keys(self) -> dict[str, Key]:
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            self.counters["hits"] += 1
+            return self._keys
+
+        await self._refresh_if_allowed()
+        return self._keys
+
+    async def get_key(self, kid: Optional[str]) -> Optional[Key]:
+        if not kid:
+            return None
+
+        keys = await self.get_keys()
+        if kid in keys:
+            return keys[kid]
+
+        self.counters["kid_misses"] += 1
+        if time.monotonic() - self._fetched_at >= self.min_refresh_interval:
+            await self._refresh_if_allowed()
+        return self._keys.get(kid)
+
+    async def prefetch(self) -> None:
+        if self.url:
+            await self._refresh_if_allowed()
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "keys": len(self._keys),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 3) if self._loaded_at is not None else None,
+            "failing": time.monotonic() < self._failed_until
+        }
+
+    async def _refresh_if_allowed(self) -> None:
+        if time.monotonic() < self._failed_until:
+            self.counters["negative_hits"] += 1
+            return
+
+        if self._inflight is not None and not self._inflight.done():
+            self.counters["coalesced"] += 1
+        else:
+            self._inflight = asyncio.create_task(self._refresh())
+        await asyncio.shield(self._inflight)
+
+    async def _refresh(self) -> None:
+        self.counters["refreshes"] += 1
+        self._fetched_at = time.monotonic()
+        try:
+            with observe_upstream("jwks", "fetch") as call:
+                response = await get_http_client().get(self.url)
+                call.status = response.status_code
+            response.raise_for_status()
+            jwks = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            self.counters["refresh_errors"] += 1
+            self._failed_until = time.monotonic() + self.failure_ttl
+            logger.warning("JWKS refresh failed: %s", e)
+            return
+
+        keys = build_key_index(jwks)
+        removed = self._keys.keys() - keys.keys()
+        self._jwks = jwks
+        self._keys = keys
+        self._loaded_at = time.monotonic()
+        if removed and self._on_keys_removed is not None:
+            logger.info("JWKS rotated out keys: %s", ", ".join(sorted(removed)))
+            self._on_keys_removed()
+
+
+def build_key_index(jwks: dict) -> dict[str, Key]:
+    keys = {}
+    for key in jwks.get("keys", []):
+        if not key.get("kid"):
+            continue
+        try:
+            keys[key["kid"]] = jwk.construct(key, algorithm=key.get("alg", "RS256"))
+        except JOSEError:
+            continue
+    return keys
@@ -0,0 +1,20 @@
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> Callable[[str], Any]:
+    """Module ``__getattr__`` that imports each exported name on first access.
+
+    ``exports`` maps a public name to the module defining it, so importing
+    the package (or any submodule of it) does not pull in the rest.
+    """
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module), name)
+        vars(importlib.import_module(package))[name] = value
+        return value
+
+    return __getattr__
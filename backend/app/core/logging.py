@@ -0,0 +1,226 @@
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings
+
+SQL_LOGGER = "sqlalchemy.engine"
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,64}$")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+_listener: Optional[QueueListener] = None
+_output: Optional[logging.Handler] = None
+
+# Attributes every LogRecord has; anything else was passed via ``extra=``.
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingRateLimitFilter(logging.Filter):
+    """Per-logger sampling and token-bucket rate limiting.
+
+    Records below WARNING from a logger with a sample rate are kept with that
+    probability. Records below ERROR are then limited to ``rate`` per second
+    per logger, with bursts up to ``burst``. Errors always pass.
+
+    SQLAlchemy logs a statement and then its parameters as two records, so
+    SQL records are decided per statement: a parameters line shares the
+    fate of the statement logged just before it.
+    """
+
+    def __init__(self, rate: float, burst: int, sample_rates: dict[str, float]):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_rates = sample_rates
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._keep_sql_statement: dict[str, bool] = {}
+        self.counters = {"sampled_out": 0, "rate_limited": 0}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+
+        if record.name == SQL_LOGGER or record.name.startswith(SQL_LOGGER + "."):
+            if isinstance(record.msg, str) and record.msg.startswith("["):
+                # "[generated in ...] (params)" follows its statement.
+                return self._keep_sql_statement.get(record.name, False)
+            keep = self._admit(record)
+            self._keep_sql_statement[record.name] = keep
+            return keep
+
+        return self._admit(record)
+
+    def _admit(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            sample_rate = self._sample_rate(record.name)
+            if sample_rate < 1.0 and random.random() >= sample_rate:
+                self.counters["sampled_out"] += 1
+                return False
+
+        if self.rate <= 0:
+            return True
+
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(record.name, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        if tokens < 1.0:
+            self._buckets[record.name] = (tokens, now)
+            self.counters["rate_limited"] += 1
+            return False
+        self._buckets[record.name] = (tokens - 1.0, now)
+        return True
+
+    def _sample_rate(self, name: str) -> float:
+        while name:
+            if name in self.sample_rates:
+                return self.sample_rates[name]
+            name = name.rpartition(".")[0]
+        return 1.0
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Merges the message on the caller's thread; formatting happens in the listener."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not getattr(record, "request_id", None):
+            record.request_id = "-"
+        return super().format(record)
+
+
+log_limiter = SamplingRateLimitFilter(rate=0, burst=0, sample_rates={})
+
+
+def configure_logging(settings: Settings) -> None:
+    """Install the queued log pipeline, or re-apply ``settings`` to it.
+
+    The pipeline is process-wide, so when several apps are created the
+    last one's logging settings apply to all of them.
+    """
+    global _listener, _output
+    sample_rates = dict(settings.log_sample_rates)
+    sample_rates[SQL_LOGGER] = settings.sql_log_sample_rate
+    log_limiter.rate = settings.log_rate_limit_per_second
+    log_limiter.burst = settings.log_rate_limit_burst
+    log_limiter.sample_rates = sample_rates
+
+    if _listener is None:
+        _output = logging.StreamHandler(sys.stdout)
+
+        handler = DeferredQueueHandler(queue.SimpleQueue())
+        handler.addFilter(RequestContextFilter())
+        handler.addFilter(log_limiter)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(handler)
+
+        _listener = QueueListener(handler.queue, _output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+    _output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+    logging.getLogger().setLevel(settings.log_level.upper())
+
+    # SQL statements are a separate channel: off unless a sample rate is set.
+    logging.getLogger(SQL_LOGGER).setLevel(logging.INFO if settings.sql_log_sample_rate > 0 else logging.WARNING)
+
+
+def shutdown_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """Tags each request with an ID for log records and the ``X-Request-ID`` response header.
+
+    A well-formed incoming ``X-Request-ID`` is reused so IDs can be traced
+    across a proxy; otherwise a new one is generated.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex
+
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
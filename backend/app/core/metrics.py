@@ -0,0 +1,313 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect and three additions."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in list(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{format_labels(names, labels + (format_value(bound),))} {cumulative}"
+            yield f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total)}"
+            yield f"{self.name}_count{format_labels(self.labelnames, labels)} {count}"
+
+
+class GaugeCallback:
+    """Gauge whose samples are read from ``callback`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...],
+        callback: Callable[[], Iterator[tuple[tuple, float]]]
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for labels, value in self.callback():
+            yield f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+
+
+class CounterCallback(GaugeCallback):
+    """Counter read from ``callback`` at scrape time; the values must only grow."""
+
+    kind = "counter"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list = []
+        self._caches: dict[str, tuple[Callable[[], dict], tuple[str, ...], tuple[str, ...]]] = {}
+        self._stats: dict[str, Callable[[], dict]] = {}
+        self.register(CounterCallback(
+            "cache_hits_total", "Cache lookups answered from the cache.", ("cache",),
+            lambda: self._cache_samples(0)
+        ))
+        self.register(CounterCallback(
+            "cache_misses_total", "Cache lookups that fell through to the source.", ("cache",),
+            lambda: self._cache_samples(1)
+        ))
+        self.register(GaugeCallback(
+            "cache_hit_ratio", "Hits over lookups since process start.", ("cache",),
+            lambda: self._cache_samples(2)
+        ))
+        self.register(GaugeCallback(
+            "component_stat", "Numeric counters and levels reported by app components.",
+            ("component", "stat"),
+            self._stat_samples
+        ))
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_cache(
+        self,
+        name: str,
+        stats: Callable[[], dict],
+        hit_keys: tuple[str, ...] = ("hits",),
+        miss_keys: tuple[str, ...] = ("misses",)
+    ) -> None:
+        self._caches[name] = (stats, hit_keys, miss_keys)
+
+    def register_stats(self, name: str, stats: Callable[[], dict]) -> None:
+        self._stats[name] = stats
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _cache_samples(self, index: int) -> Iterator[tuple[tuple, float]]:
+        for name, (stats, hit_keys, miss_keys) in self._caches.items():
+            values = stats()
+            hits = sum(values.get(key, 0) for key in hit_keys)
+            misses = sum(values.get(key, 0) for key in miss_keys)
+            lookups = hits + misses
+            yield (name,), (hits, misses, hits / lookups if lookups else 0.0)[index]
+
+    def _stat_samples(self) -> Iterator[tuple[tuple, float]]:
+        for name, stats in self._stats.items():
+            for key, value in stats().items():
+                if isinstance(value, (int, float)):
+                    yield (name, key), value
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.register(Counter(
+    "http_requests_total", "HTTP responses by route and status.", ("method", "route", "status")
+))
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "Time to the end of the response body.", ("method", "route")
+))
+db_query_duration = registry.register(Histogram(
+    "db_query_duration_seconds", "Statement execution time.", ("engine", "statement")
+))
+db_pool_checkout_wait = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.", ("engine",)
+))
+upstream_requests = registry.register(Counter(
+    "upstream_requests_total", "Outbound calls by service, operation and outcome.",
+    ("service", "operation", "outcome")
+))
+upstream_duration = registry.register(Histogram(
+    "upstream_request_duration_seconds", "Outbound call latency.", ("service", "operation")
+))
+
+
+class UpstreamCall:
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status: Optional[int] = None
+
+
+@contextmanager
+def observe_upstream(service: str, operation: str) -> Iterator[UpstreamCall]:
+    call = UpstreamCall()
+    outcome = "error"
+    start = time.perf_counter()
+    try:
+        yield call
+        outcome = f"{call.status // 100}xx" if call.status else "ok"
+    finally:
+        upstream_duration.observe(time.perf_counter() - start, service, operation)
+        upstream_requests.inc(service, operation, outcome)
+
+
+def statement_kind(statement: str) -> str:
+    kind = statement.lstrip()[:6].upper()
+    if kind in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        return kind
+    return "OTHER"
+
+
+def instrument_engine(sync_engine, name: str) -> None:
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get("query_start")
+        if starts:
+            db_query_duration.observe(time.perf_counter() - starts.pop(), name, statement_kind(statement))
+
+    pool = sync_engine.pool
+    registry.register_stats(f"db_pool_{name}", lambda: {
+        "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+        "size": pool.size() if hasattr(pool, "size") else 0
+    })
+
+
+def timed_pool_class(name: str):
+    """A queue pool that records how long each checkout waited, labelled ``name``."""
+
+    class TimedQueuePool(AsyncAdaptedQueuePool):
+        # Pools log under their module name; stay in the sqlalchemy hierarchy.
+        __module__ = AsyncAdaptedQueuePool.__module__
+
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                db_pool_checkout_wait.observe(time.perf_counter() - start, name)
+
+    return TimedQueuePool
+
+
+def route_template(scope: Scope) -> str:
+    # Depending on the FastAPI version the matched route's path may or may
+    # not include the prefix of the router it was included with; rebuild
+    # the prefix from the request path so both label the same way.
+    template = scope["route"].path
+    try:
+        rendered = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    if rendered and path.endswith(rendered):
+        return path[:len(path) - len(rendered)] + template
+    return template
+
+
+class MetricsMiddleware:
+    """Per-route latency histogram and status counter.
+
+    Routes are labelled with their path template (``/projects/{id}``), so
+    label cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if scope.get("route") is not None:
+                path = route_template(scope)
+            elif status == 304:
+                # Answered by ConditionalGetMiddleware before routing; only
+                # registered paths get there, so the raw path is bounded.
+                path = scope["path"]
+            else:
+                path = "unmatched"
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - start, method, path)
+            http_requests.inc(method, path, status)
@@ -0,0 +1,127 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+from app.core.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceededError(RuntimeError):
+    pass
+
+
+class RequestProfile:
+    __slots__ = ("scope", "queries", "db_time", "budget")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.queries = 0
+        self.db_time = 0.0
+        self.budget: Optional[int] = None
+
+    @property
+    def route(self) -> str:
+        if self.scope.get("route") is not None:
+            return f"{self.scope['method']} {route_template(self.scope)}"
+        return f"{self.scope['method']} {self.scope['path']}"
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"'
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def query_profiler_enabled(settings: Settings) -> bool:
+    return settings.debug or settings.query_profiler
+
+
+def profile_engine(sync_engine) -> None:
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("profile_start", []).append(time.perf_counter())
+
+    settings = get_settings()
+    slow_query_threshold_ms = settings.slow_query_threshold_ms
+    # Bound parameters carry emails, message bodies and IPs; only log them
+    # when explicitly asked to.
+    log_params = settings.slow_query_log_params
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany) -> None:
+        starts = conn.info.get("profile_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.queries += 1
+            profile.db_time += elapsed
+
+        if elapsed * 1000 >= slow_query_threshold_ms:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s%s",
+                elapsed * 1000,
+                profile.route if profile is not None else "background task",
+                " ".join(statement.split()),
+                f" | params={parameters!r}" if log_params else ""
+            )
+
+
+def query_budget(max_queries: int):
+    """Route dependency declaring how many queries a request may issue.
+
+    Exceeding it is logged; with ``query_budget_enforce`` the request raises
+    ``QueryBudgetExceededError`` once the response is done, so tests fail.
+    """
+
+    async def declare_budget() -> None:
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.budget = max_queries
+
+    return declare_budget
+
+
+class QueryProfilerMiddleware:
+    """Counts queries and database time per request for ``Server-Timing``.
+
+    The header carries what ran before the response started; queries made
+    while streaming a body still count towards the budget check.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope)
+        token = _current_profile.set(profile)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+
+        if profile.budget is not None and profile.queries > profile.budget:
+            detail = f"{profile.route} issued {profile.queries} queries (budget {profile.budget})"
+            if get_settings().query_budget_enforce:
+                raise QueryBudgetExceededError(detail)
+            logger.warning("Query budget exceeded: %s", detail)
@@ -0,0 +1,82 @@
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from app.core.config import Settings, get_settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def to_jsonable(content: Any) -> Any:
+    if isinstance(content, BaseModel):
+        return content.model_dump(mode="json")
+    if isinstance(content, (list, tuple)):
+        return [to_jsonable(item) for item in content]
+    return content
+
+
+def dumps(content: Any) -> bytes:
+    content = to_jsonable(content)
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), default=str).encode()
+
+
+class SerializedCache:
+    """Serialized response bodies keyed by route key and data-version token.
+
+    An entry is reused while the token is unchanged and for at most ``ttl``
+    seconds, which bounds staleness from writes made by other workers.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 5.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[str, float, bytes]] = OrderedDict()
+        self.counters = {"hits": 0, "misses": 0}
+
+    async def get_or_build(
+        self,
+        key: Hashable,
+        version: str,
+        build: Callable[[], Awaitable[Any]]
+    ) -> bytes:
+        entry = self._entries.get(key)
+        if entry and entry[0] == version and time.monotonic() - entry[1] < self.ttl:
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return entry[2]
+
+        self.counters["misses"] += 1
+        body = dumps(await build())
+        self._entries[key] = (version, time.monotonic(), body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return body
+
+
+serialized_cache = SerializedCache()
+
+
+def configure_responses(settings: Settings) -> None:
+    serialized_cache.ttl = settings.fast_json_cache_ttl
+
+
+async def respond(
+    key: Hashable,
+    version: Callable[[], str],
+    build: Callable[[], Awaitable[Any]]
+) -> Any:
+    if not get_settings().fast_json_responses:
+        return await build()
+
+    body = await serialized_cache.get_or_build(key, version(), build)
+    return Response(content=body, media_type="application/json")
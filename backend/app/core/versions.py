@@ -0,0 +1,53 @@
+import secrets
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_boot_id = secrets.token_hex(4)
+_versions: dict[str, int] = {}
+
+
+def bump_version(name: str) -> None:
+    _versions[name] = _versions.get(name, 0) + 1
+
+
+def bump_version_on_commit(session, name: str) -> None:
+    """Bump ``name`` once ``session`` commits; nothing happens on rollback.
+
+    Bumping before the commit would let a conditional GET read the new
+    token while the old data is still all that other sessions can see.
+    """
+    session.info.setdefault("bump_versions", set()).add(name)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_versions(session: Session) -> None:
+    for name in session.info.pop("bump_versions", ()):
+        bump_version(name)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_versions(session: Session) -> None:
+    session.info.pop("bump_versions", None)
+
+
+def data_version(*names: str) -> str:
+    # Counters are per process; the boot id keeps two workers from ever
+    # producing the same token for different data.
+    return _boot_id + "-" + ".".join(str(_versions.get(name, 0)) for name in names)
+
+
+def projects_version() -> str:
+    return data_version("projects", "github_repos")
+
+
+def stats_version() -> str:
+    return data_version("projects", "github_repos", "visitors", "messages")
+
+
+def visitors_version() -> str:
+    return data_version("visitors")
+
+
+def messages_version() -> str:
+    return data_version("messages")
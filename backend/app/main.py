@@ -1,51 +1,200 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+from typing import Optional
 
-from app.core import get_settings, init_database
-from app.routers import portfolio_router, contact_router, health_router, visitors_router
+from app.core import Settings, get_settings, use_settings, init_database, http_pool
+from app.core.auth import claims_cache, configure_auth, jwks_manager
+from app.core.database import (
+    AsyncSessionLocal,
+    dispose_engines,
+    init_engines,
+    replica_health,
+    replica_health_loop,
+)
+from app.core.identity import identity_cache
+from app.core.logging import RequestIdMiddleware, configure_logging, log_limiter
+from app.core.metrics import MetricsMiddleware, registry
+from app.core.profiler import QueryProfilerMiddleware, query_profiler_enabled
+from app.core.responses import configure_responses, serialized_cache
+from app.core.http_cache import CachePolicy, ConditionalGetMiddleware, cache_control
+from app.core.versions import projects_version, stats_version, visitors_version, messages_version
+from app.routers import portfolio_router, contact_router, health_router, visitors_router, exports_router
+from app.services.github_cache import configure_repo_cache, repo_cache
+from app.services.project_service import project_sync_loop
+from app.services.visit_buffer import configure_visit_buffer, visit_buffer
+from app.services.visit_counter import (
+    backfill_unique_sketches,
+    ensure_profile_visitor_sketch,
+    reconcile_visitor_totals,
+    visit_counter,
+    visitor_reconcile_loop,
+)
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
+
+def configure(settings: Settings) -> Settings:
+    # Settings live in module-level singletons, so the app that starts
+    # last in a process is the one they reflect.
+    use_settings(settings)
+    configure_logging(settings)
+    configure_auth(settings)
+    configure_responses(settings)
+    configure_repo_cache(settings)
+    configure_visit_buffer(settings)
+    return settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    settings = configure(app.state.settings)
     logger.info("Starting Portfolio API...")
     
+    engines = init_engines(settings)
     try:
-        await init_database()
+        await init_database({"visitor_stats.unique_sketch": backfill_unique_sketches})
         logger.info("Database initialized")
+        await reconcile_visitor_totals()
+        await ensure_profile_visitor_sketch()
+        async with AsyncSessionLocal() as session:
+            await visit_counter.load(session)
     except Exception as e:
-        logger.warning(f"Database initialization skipped: {e}")
+        logger.warning("Database initialization skipped: %s", e)
+    
+    await http_pool.start()
+    await jwks_manager.prefetch()
+    await visit_buffer.start()
+    
+    background_tasks = [
+        asyncio.create_task(project_sync_loop(settings.project_sync_interval)),
+        asyncio.create_task(visitor_reconcile_loop(settings.visitor_reconcile_interval))
+    ]
+    if engines.replica is not None:
+        background_tasks.append(
+            asyncio.create_task(replica_health_loop(settings.database_replica_check_interval))
+        )
     
     yield
     
+    for task in background_tasks:
+        task.cancel()
+    for task in background_tasks:
+        with suppress(asyncio.CancelledError):
+            await task
+    
+    await visit_buffer.stop()
+    await repo_cache.close()
+    await http_pool.close()
+    await dispose_engines()
+    
     logger.info("Shutting down Portfolio API...")
 
 
-app = FastAPI(
-    title=settings.app_name,
-    version=settings.app_version,
-    description="Personal portfolio API with Clerk authentication",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    lifespan=lifespan
-)
+STATIC_POLICY = CachePolicy(cache_control(3600, stale_while_revalidate=86400), static=True)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+CACHE_POLICIES = {
+    "/api/v1/portfolio/profile": STATIC_POLICY,
+    "/api/v1/portfolio/skills": STATIC_POLICY,
+    "/api/v1/portfolio/experience": STATIC_POLICY,
+    "/api/v1/portfolio/certificates": STATIC_POLICY,
+    "/api/v1/portfolio/projects": CachePolicy(
+        cache_control(300, stale_while_revalidate=3600),
+        version=projects_version,
+        version_ttl=300
+    ),
+    "/api/v1/portfolio/projects/featured": CachePolicy(
+        cache_control(300, stale_while_revalidate=3600),
+        version=projects_version,
+        version_ttl=300
+    ),
+    "/api/v1/portfolio/stats": CachePolicy(
+        cache_control(60, stale_while_revalidate=300),
+        version=stats_version
+    ),
+    "/api/v1/visitors/count": CachePolicy(
+        cache_control(10, stale_while_revalidate=60),
+        version=visitors_version,
+        version_ttl=10
+    ),
+    "/api/v1/visitors/stats": CachePolicy(
+        cache_control(10, stale_while_revalidate=60),
+        version=visitors_version,
+        version_ttl=10
+    ),
+    "/api/v1/contact/messages/count": CachePolicy(
+        "private, no-cache",
+        version=messages_version,
+        version_ttl=10
+    ),
+}
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """Build the API for ``settings`` (read from the environment when omitted).
+
+    Nothing here touches the database or the network: engines and the HTTP
+    client are created in ``lifespan`` and disposed when it ends.
+    """
+    settings = configure(settings or get_settings())
+
+    app = FastAPI(
+        title=settings.app_name,
+        version=settings.app_version,
+        description="Personal portfolio API with Clerk authentication",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        lifespan=lifespan
+    )
+    app.state.settings = settings
+
+    app.add_middleware(ConditionalGetMiddleware, policies=CACHE_POLICIES)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    if query_profiler_enabled(settings):
+        app.add_middleware(QueryProfilerMiddleware)
+
+    if settings.metrics_enabled:
+        app.add_middleware(MetricsMiddleware)
+
+        registry.register_cache("github_repos", repo_cache.stats, hit_keys=("hits", "stale_hits"))
+        registry.register_cache("jwt_claims", claims_cache.stats)
+        registry.register_cache("jwks", jwks_manager.stats, miss_keys=("refreshes",))
+        registry.register_cache("identity", identity_cache.stats)
+        registry.register_cache("serialized_responses", lambda: serialized_cache.counters)
+        registry.register_cache(
+            "http_connections",
+            http_pool.stats,
+            hit_keys=("connections_reused",),
+            miss_keys=("connections_opened",)
+        )
+        registry.register_stats("visit_buffer", visit_buffer.stats)
+        registry.register_stats("replica", replica_health.stats)
+        registry.register_stats("logging", lambda: log_limiter.counters)
+
+    app.add_middleware(RequestIdMiddleware)
+
+    app.include_router(health_router)
+    app.include_router(portfolio_router, prefix="/api/v1")
+    app.include_router(contact_router, prefix="/api/v1")
+    app.include_router(visitors_router, prefix="/api/v1")
+    app.include_router(exports_router, prefix="/api/v1")
+
+    return app
 
-app.include_router(health_router)
-app.include_router(portfolio_router, prefix="/api/v1")
-app.include_router(contact_router, prefix="/api/v1")
-app.include_router(visitors_router, prefix="/api/v1")
 
+def __getattr__(name: str):
+    # Keeps ``uvicorn app.main:app`` working; the app is built on first access.
+    if name == "app":
+        globals()["app"] = create_app()
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
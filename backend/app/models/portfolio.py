@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, DateTime, Integer, Boolean, JSON, func, Date
+from sqlalchemy import String, Text, DateTime, Integer, Boolean, JSON, LargeBinary, Index, func, Date
 from sqlalchemy.orm import Mapped, mapped_column
 from app.core.database import Base
 
@@ -18,14 +18,15 @@ class Project(Base):
     
     primary_language: Mapped[Optional[str]] = mapped_column(String(100))
     languages: Mapped[Optional[dict]] = mapped_column(JSON, default=dict)
+    language_bytes: Mapped[Optional[dict]] = mapped_column(JSON, default=dict)
     topics: Mapped[Optional[list]] = mapped_column(JSON, default=list)
     
     stars_count: Mapped[int] = mapped_column(Integer, default=0)
     forks_count: Mapped[int] = mapped_column(Integer, default=0)
     
-    is_featured: Mapped[bool] = mapped_column(Boolean, default=False)
+    is_featured: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
     is_forked: Mapped[bool] = mapped_column(Boolean, default=False)
-    category: Mapped[Optional[str]] = mapped_column(String(100))
+    category: Mapped[Optional[str]] = mapped_column(String(100), index=True)
     
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -33,6 +34,9 @@ class Project(Base):
 
 class ContactMessage(Base):
     __tablename__ = "contact_messages"
+    __table_args__ = (
+        Index("ix_contact_messages_created_at_id", "created_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
@@ -57,10 +61,21 @@ class VisitorStats(Base):
     visit_date: Mapped[datetime] = mapped_column(Date, unique=True, index=True)
     visit_count: Mapped[int] = mapped_column(Integer, default=0)
     unique_visitors: Mapped[int] = mapped_column(Integer, default=0)
+    unique_sketch: Mapped[Optional[bytes]] = mapped_column(LargeBinary, deferred=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
 
+class VisitorTotal(Base):
+    __tablename__ = "visitor_totals"
+    
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    period: Mapped[str] = mapped_column(String(16), unique=True, index=True)
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    unique_sketch: Mapped[Optional[bytes]] = mapped_column(LargeBinary, deferred=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
 class VisitorLog(Base):
     __tablename__ = "visitor_logs"
     
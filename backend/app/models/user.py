@@ -24,7 +24,7 @@ class ProfileVisitor(Base):
     __tablename__ = "profile_visitors"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    user_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
     
     ip_address: Mapped[str | None] = mapped_column(String(45))
     user_agent: Mapped[str | None] = mapped_column(String(512))
@@ -33,4 +33,4 @@ class ProfileVisitor(Base):
     city: Mapped[str | None] = mapped_column(String(100))
     
     page_visited: Mapped[str] = mapped_column(String(255), default="/")
-    visited_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    visited_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), index=True)
@@ -2,10 +2,12 @@ from app.routers.portfolio import portfolio_router
 from app.routers.contact import contact_router
 from app.routers.health import health_router
 from app.routers.visitors import visitors_router
+from app.routers.exports import exports_router
 
 __all__ = [
     "portfolio_router",
     "contact_router",
     "health_router",
-    "visitors_router"
+    "visitors_router",
+    "exports_router"
 ]
@@ -1,22 +1,29 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
-from app.core import get_db_session, get_current_user_optional
+from app.core import get_db_session, get_read_session, get_current_user_optional, UserIdentity
+from app.core.versions import bump_version_on_commit
+from app.core.profiler import query_budget
 from app.schemas import ContactMessageCreate, ContactSubmitResponse
 from app.models.portfolio import ContactMessage
-from app.models.user import User
+from app.services.contact_service import InvalidCursorError, count_matching_messages, get_messages_page
 from sqlalchemy import select
 
 contact_router = APIRouter(prefix="/contact", tags=["Contact"])
 
 
-@contact_router.post("/submit", response_model=ContactSubmitResponse, status_code=201)
+@contact_router.post(
+    "/submit",
+    response_model=ContactSubmitResponse,
+    status_code=201,
+    dependencies=[Depends(query_budget(5))]
+)
 async def submit_contact_message(
     payload: ContactMessageCreate,
     request: Request,
     db_session: AsyncSession = Depends(get_db_session),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[UserIdentity] = Depends(get_current_user_optional)
 ):
     
     ip_address = request.client.host if request.client else None
@@ -34,6 +41,7 @@ async def submit_contact_message(
     db_session.add(message)
     await db_session.flush()
     await db_session.refresh(message)
+    bump_version_on_commit(db_session, "messages")
     
     return ContactSubmitResponse(
         success=True,
@@ -42,17 +50,33 @@ async def submit_contact_message(
     )
 
 
-@contact_router.get("/messages")
+@contact_router.get("/messages", dependencies=[Depends(query_budget(2))])
 async def get_all_messages(
-    db_session: AsyncSession = Depends(get_db_session)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    is_read: Optional[bool] = None,
+    is_archived: Optional[bool] = None,
+    db_session: AsyncSession = Depends(get_read_session)
 ):
-    
-    query = select(ContactMessage).order_by(ContactMessage.created_at.desc())
-    result = await db_session.execute(query)
-    messages = list(result.scalars().all())
+    try:
+        messages, next_cursor = await get_messages_page(
+            db_session,
+            limit=limit,
+            cursor=cursor,
+            is_read=is_read,
+            is_archived=is_archived
+        )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    total_count = await count_matching_messages(db_session, is_read=is_read, is_archived=is_archived)
     
     return {
-        "total_count": len(messages),
+        "total_count": total_count,
+        "count": len(messages),
+        "next_cursor": next_cursor,
         "messages": [
             {
                 "id": msg.id,
@@ -63,15 +87,16 @@ async def get_all_messages(
                 "company_name": msg.company_name,
                 "created_at": msg.created_at.isoformat() if msg.created_at else None,
                 "is_read": msg.is_read,
+                "is_archived": msg.is_archived,
             }
             for msg in messages
         ]
     }
 
 
-@contact_router.get("/messages/count")
+@contact_router.get("/messages/count", dependencies=[Depends(query_budget(1))])
 async def get_messages_count(
-    db_session: AsyncSession = Depends(get_db_session)
+    db_session: AsyncSession = Depends(get_read_session)
 ):
     
     from sqlalchemy import func
@@ -0,0 +1,39 @@
+from datetime import date
+from enum import Enum
+from typing import Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.core import get_current_admin_required, UserIdentity
+from app.core.profiler import query_budget
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_stream
+
+exports_router = APIRouter(prefix="/exports", tags=["Exports"])
+
+
+class ExportSource(str, Enum):
+    VISITOR_LOGS = "visitor-logs"
+    PROFILE_VISITORS = "profile-visitors"
+    CONTACT_MESSAGES = "contact-messages"
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+@exports_router.get("/{source}", dependencies=[Depends(query_budget(4))])
+async def export_rows(
+    source: ExportSource,
+    format: ExportFormat = ExportFormat.NDJSON,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    admin: UserIdentity = Depends(get_current_admin_required)
+):
+    filename = f"{source.value}-{start or 'all'}-{end or 'latest'}.{format.value}"
+    return StreamingResponse(
+        export_stream(source.value, format.value, start, end),
+        media_type=EXPORT_MEDIA_TYPES[format.value],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
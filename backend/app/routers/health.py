@@ -1,28 +1,53 @@
+import secrets
 from datetime import datetime
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response
 
-from app.core import get_settings
+from app.core import get_settings, http_pool
+from app.core.database import replica_health
+from app.core.metrics import CONTENT_TYPE, registry
 from app.schemas import HealthCheckResponse
 
 health_router = APIRouter(tags=["Health"])
-settings = get_settings()
 
 
 @health_router.get("/health", response_model=HealthCheckResponse)
 async def health_check():
     return HealthCheckResponse(
         status="healthy",
-        version=settings.app_version,
+        version=get_settings().app_version,
         database="connected",
         timestamp=datetime.utcnow()
     )
 
 
+@health_router.get("/health/http")
+async def http_pool_stats():
+    return http_pool.stats()
+
+
+@health_router.get("/health/replica")
+async def replica_stats():
+    return replica_health.stats()
+
+
+@health_router.get("/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    settings = get_settings()
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if settings.metrics_token and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.metrics_token}"
+    ):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
+
+
 @health_router.get("/")
 async def root():
     return {
         "message": "Ashish Gupta Portfolio API",
-        "version": settings.app_version,
+        "version": get_settings().app_version,
         "docs": "/docs",
         "github": "https://github.com/Aashish-Op"
     }
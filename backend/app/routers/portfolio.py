@@ -2,7 +2,10 @@ from fastapi import APIRouter, Depends, Request
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core import get_db_session, get_current_user_optional
+from app.core import get_read_session, get_current_user_optional, UserIdentity
+from app.core.responses import respond
+from app.core.versions import projects_version, stats_version
+from app.core.profiler import query_budget
 from app.schemas import (
     ProjectResponse,
     ProjectListResponse,
@@ -13,9 +16,10 @@ from app.schemas import (
     PortfolioStatsResponse,
     ProfileInfoResponse
 )
-from app.services import fetch_github_repos, get_messages_count
+from app.services import get_messages_count
+from app.services.github_service import aggregate_languages
+from app.services.project_service import list_projects
 from app.services.visitor_service import track_visitor, get_visitor_stats
-from app.models.user import User
 
 portfolio_router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
 
@@ -25,29 +29,51 @@ async def get_profile():
     return ProfileInfoResponse()
 
 
-@portfolio_router.get("/projects", response_model=ProjectListResponse)
-async def get_projects(category: Optional[str] = None):
-    repos = await fetch_github_repos()
+@portfolio_router.get(
+    "/projects",
+    response_model=ProjectListResponse,
+    dependencies=[Depends(query_budget(2))]
+)
+async def get_projects(
+    category: Optional[str] = None,
+    featured_only: bool = False,
+    db_session: AsyncSession = Depends(get_read_session)
+):
+    async def build():
+        projects = await list_projects(db_session, category=category, featured_only=featured_only)
+        return ProjectListResponse(
+            projects=[ProjectResponse.model_validate(p) for p in projects],
+            total_count=len(projects)
+        )
     
-    if category:
-        repos = [r for r in repos if r.get("category") == category]
+    return await respond(("projects", category, featured_only), projects_version, build)
+
+
+@portfolio_router.get(
+    "/projects/featured",
+    response_model=list[ProjectResponse],
+    dependencies=[Depends(query_budget(2))]
+)
+async def get_featured_projects(db_session: AsyncSession = Depends(get_read_session)):
+    async def build():
+        featured = await list_projects(db_session, featured_only=True)
+        return [ProjectResponse.model_validate(p) for p in featured]
     
-    return ProjectListResponse(
-        projects=[ProjectResponse(**r) for r in repos],
-        total_count=len(repos)
-    )
+    return await respond("projects/featured", projects_version, build)
 
 
-@portfolio_router.get("/projects/featured", response_model=list[ProjectResponse])
-async def get_featured_projects():
-    repos = await fetch_github_repos()
-    featured = [r for r in repos if r.get("is_featured")]
-    return [ProjectResponse(**r) for r in featured]
+@portfolio_router.get(
+    "/stats",
+    response_model=PortfolioStatsResponse,
+    dependencies=[Depends(query_budget(4))]
+)
+async def get_stats(db_session: AsyncSession = Depends(get_read_session)):
+    return await respond("stats", stats_version, lambda: build_stats(db_session))
 
 
-@portfolio_router.get("/stats", response_model=PortfolioStatsResponse)
-async def get_stats(db_session: AsyncSession = Depends(get_db_session)):
-    repos = await fetch_github_repos()
+async def build_stats(db_session: AsyncSession) -> PortfolioStatsResponse:
+    projects = await list_projects(db_session)
+    repos = [ProjectResponse.model_validate(p) for p in projects]
     visitor_stats = await get_visitor_stats(db_session)
     messages_count = await get_messages_count(db_session)
     
@@ -56,11 +82,11 @@ async def get_stats(db_session: AsyncSession = Depends(get_db_session)):
     total_forks = 0
     
     for repo in repos:
-        if repo.get("primary_language"):
-            lang = repo["primary_language"]
+        if repo.primary_language:
+            lang = repo.primary_language
             lang_counts[lang] = lang_counts.get(lang, 0) + 1
-        total_stars += repo.get("stars_count", 0)
-        total_forks += repo.get("forks_count", 0)
+        total_stars += repo.stars_count
+        total_forks += repo.forks_count
     
     return PortfolioStatsResponse(
         total_projects=len(repos),
@@ -70,6 +96,12 @@ async def get_stats(db_session: AsyncSession = Depends(get_db_session)):
             {"name": k, "count": v} 
             for k, v in sorted(lang_counts.items(), key=lambda x: -x[1])[:5]
         ],
+        # Synced rows carry the byte counts, so this never waits on GitHub;
+        # only the unsynced fallback list is made of plain repo dicts.
+        languages=aggregate_languages(
+            p.get("language_bytes") if isinstance(p, dict) else p.language_bytes
+            for p in projects
+        ),
         visitors_count=visitor_stats["total_visitors"],
         messages_count=messages_count
     )
@@ -144,19 +176,17 @@ async def get_certificates():
     ]
 
 
-@portfolio_router.post("/track-visit")
+@portfolio_router.post("/track-visit", dependencies=[Depends(query_budget(3))])
 async def track_page_visit(
     request: Request,
     page: str = "/",
-    db_session: AsyncSession = Depends(get_db_session),
-    current_user: Optional[User] = Depends(get_current_user_optional)
+    current_user: Optional[UserIdentity] = Depends(get_current_user_optional)
 ):
-    await track_visitor(
-        db_session=db_session,
+    tracked = await track_visitor(
         ip_address=request.client.host if request.client else None,
         user_agent=request.headers.get("user-agent"),
         referrer=request.headers.get("referer"),
         page=page,
         user_id=current_user.id if current_user else None
     )
-    return {"tracked": True}
+    return {"tracked": tracked}
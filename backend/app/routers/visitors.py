@@ -1,88 +1,73 @@
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from datetime import date
+from sqlalchemy import select
 
-from app.core import get_db_session
-from app.models.portfolio import VisitorStats, VisitorLog
+from app.core import get_read_session
+from app.core.responses import respond
+from app.core.versions import visitors_version
+from app.core.profiler import query_budget
+from app.models.portfolio import VisitorStats
+from app.services.visit_buffer import VisitEvent, visit_buffer
+from app.services.visit_counter import visit_counter, estimate_unique_visitors, utc_today
 
 visitors_router = APIRouter(prefix="/visitors", tags=["Visitors"])
 
 
-@visitors_router.post("/track")
-async def track_visitor(
-    request: Request,
-    db_session: AsyncSession = Depends(get_db_session)
-):
+@visitors_router.post("/track", dependencies=[Depends(query_budget(0))])
+async def track_visitor(request: Request):
     ip_address = request.client.host if request.client else None
     user_agent = request.headers.get("user-agent", "")[:500]
     referrer = request.headers.get("referer", "")[:500]
     
-    visitor_log = VisitorLog(
+    event = VisitEvent(
+        table="visitor_logs",
         ip_address=ip_address,
         user_agent=user_agent,
         referrer=referrer,
         page_visited="/"
     )
-    db_session.add(visitor_log)
-    
-    today = date.today()
-    stats_query = select(VisitorStats).where(VisitorStats.visit_date == today)
-    result = await db_session.execute(stats_query)
-    day_stats = result.scalar_one_or_none()
-    
-    if day_stats:
-        day_stats.visit_count += 1
-    else:
-        day_stats = VisitorStats(
-            visit_date=today,
-            visit_count=1,
-            unique_visitors=1
-        )
-        db_session.add(day_stats)
-    
-    await db_session.flush()
-    
-    total_query = select(func.sum(VisitorStats.visit_count))
-    total_visits = await db_session.scalar(total_query) or 0
+    today_count = visit_counter.increment(event.visit_date)
+    await visit_buffer.submit(event)
     
     return {
         "success": True,
-        "today_count": day_stats.visit_count,
-        "total_count": total_visits
+        "today_count": today_count,
+        "total_count": visit_counter.total()
     }
 
 
-@visitors_router.get("/count")
-async def get_visitor_count(
-    db_session: AsyncSession = Depends(get_db_session)
-):
-    total_query = select(func.sum(VisitorStats.visit_count))
-    total_visits = await db_session.scalar(total_query) or 0
-    
-    today = date.today()
-    today_query = select(VisitorStats.visit_count).where(VisitorStats.visit_date == today)
-    today_visits = await db_session.scalar(today_query) or 0
-    
+@visitors_router.get("/count", dependencies=[Depends(query_budget(0))])
+async def get_visitor_count():
     return {
-        "total_visitors": total_visits,
-        "today_visitors": today_visits
+        "total_visitors": visit_counter.total(),
+        "today_visitors": visit_counter.count()
     }
 
 
-@visitors_router.get("/stats")
+@visitors_router.get("/stats", dependencies=[Depends(query_budget(2))])
 async def get_visitor_stats(
-    db_session: AsyncSession = Depends(get_db_session)
+    db_session: AsyncSession = Depends(get_read_session)
 ):
+    return await respond("visitors/stats", visitors_version, lambda: build_visitor_stats(db_session))
+
+
+async def build_visitor_stats(db_session: AsyncSession) -> dict:
     query = select(VisitorStats).order_by(VisitorStats.visit_date.desc()).limit(30)
     result = await db_session.execute(query)
     stats = list(result.scalars().all())
     
-    total_query = select(func.sum(VisitorStats.visit_count))
-    total_visits = await db_session.scalar(total_query) or 0
+    unique_visitors = await estimate_unique_visitors(
+        db_session,
+        start=stats[-1].visit_date if stats else None
+    )
+    
+    today = utc_today()
     
     return {
-        "total_all_time": total_visits,
+        "total_all_time": visit_counter.total(),
+        "total_this_year": visit_counter.total(today.strftime("%Y")),
+        "total_this_month": visit_counter.total(today.strftime("%Y-%m")),
+        "unique_visitors": unique_visitors,
         "daily_stats": [
             {
                 "date": stat.visit_date.isoformat(),
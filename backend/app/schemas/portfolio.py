@@ -78,6 +78,7 @@ class PortfolioStatsResponse(BaseModel):
     total_stars: int
     total_forks: int
     primary_languages: list[dict]
+    languages: list[dict] = Field(default_factory=list)
     visitors_count: int
     messages_count: int
 
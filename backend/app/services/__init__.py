@@ -1,12 +1,16 @@
-from app.services.github_service import fetch_github_repos
-from app.services.contact_service import create_contact_message, get_messages_count, get_all_messages
-from app.services.visitor_service import track_visitor, get_visitor_stats
+from app.core.lazy import lazy_exports
 
-__all__ = [
-    "fetch_github_repos",
-    "create_contact_message",
-    "get_messages_count",
-    "get_all_messages",
-    "track_visitor",
-    "get_visitor_stats"
-]
+_EXPORTS = {
+    "fetch_github_repos": "app.services.github_service",
+    "get_github_repos": "app.services.github_cache",
+    "repo_cache": "app.services.github_cache",
+    "create_contact_message": "app.services.contact_service",
+    "get_messages_count": "app.services.contact_service",
+    "get_all_messages": "app.services.contact_service",
+    "track_visitor": "app.services.visitor_service",
+    "get_visitor_stats": "app.services.visitor_service"
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__ = lazy_exports(__name__, _EXPORTS)
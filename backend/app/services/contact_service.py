@@ -1,9 +1,15 @@
+import base64
+import binascii
+import json
 import logging
+from datetime import datetime
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_
 
+from app.core.database import datetime_bound
 from app.models.portfolio import ContactMessage
-from app.models.user import User
+from app.core.identity import UserIdentity
 from app.schemas.portfolio import ContactMessageCreate
 
 logger = logging.getLogger(__name__)
@@ -11,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 async def create_contact_message(
     db_session: AsyncSession,
-    user: User,
+    user: UserIdentity,
     payload: ContactMessageCreate,
     ip_address: str | None
 ) -> ContactMessage:
@@ -47,5 +53,76 @@ async def get_all_messages(
     return list(result.scalars().all())
 
 
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(message: ContactMessage) -> str:
+    raw = json.dumps([message.created_at.isoformat(), message.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, message_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(message_id)
+    except (binascii.Error, ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def message_filters(is_read: Optional[bool] = None, is_archived: Optional[bool] = None) -> list:
+    filters = []
+    if is_read is not None:
+        filters.append(ContactMessage.is_read == is_read)
+    if is_archived is not None:
+        filters.append(ContactMessage.is_archived == is_archived)
+    return filters
+
+
+async def count_matching_messages(
+    db_session: AsyncSession,
+    is_read: Optional[bool] = None,
+    is_archived: Optional[bool] = None
+) -> int:
+    query = select(func.count(ContactMessage.id)).where(*message_filters(is_read, is_archived))
+    return await db_session.scalar(query) or 0
+
+
+async def get_messages_page(
+    db_session: AsyncSession,
+    limit: int,
+    cursor: Optional[str] = None,
+    is_read: Optional[bool] = None,
+    is_archived: Optional[bool] = None
+) -> tuple[list[ContactMessage], Optional[str]]:
+    query = (
+        select(ContactMessage)
+        .order_by(ContactMessage.created_at.desc(), ContactMessage.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        created_at, message_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(ContactMessage.created_at, ContactMessage.id)
+            < tuple_(datetime_bound(created_at), message_id)
+        )
+    query = query.where(*message_filters(is_read, is_archived))
+    
+    result = await db_session.execute(query)
+    messages = list(result.scalars().all())
+    
+    next_cursor = None
+    if len(messages) > limit:
+        messages = messages[:limit]
+        next_cursor = encode_cursor(messages[-1])
+    return messages, next_cursor
+
+
 def log_new_message(message: ContactMessage) -> None:
-    logger.info(f"New contact from {message.sender_name} <{message.sender_email}>: {message.subject}")
+    logger.info(
+        "New contact from %s <%s>: %s",
+        message.sender_name,
+        message.sender_email,
+        message.subject
+    )
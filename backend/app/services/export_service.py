@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from app.core.database import datetime_bound, open_read_session
+from app.models.portfolio import ContactMessage, VisitorLog
+from app.models.user import ProfileVisitor
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_SOURCES = {
+    "visitor-logs": (VisitorLog, VisitorLog.visited_at),
+    "profile-visitors": (ProfileVisitor, ProfileVisitor.visited_at),
+    "contact-messages": (ContactMessage, ContactMessage.created_at),
+}
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def stream_rows(
+    source: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> AsyncIterator[list[dict]]:
+    model, date_column = EXPORT_SOURCES[source]
+    query = select(model.__table__).order_by(model.__table__.c.id)
+    # Same bound form as the /messages cursor, so a row stamped exactly at
+    # midnight lands in the same day in both places.
+    if start:
+        query = query.where(date_column >= datetime_bound(datetime.combine(start, time.min)))
+    if end:
+        query = query.where(date_column < datetime_bound(datetime.combine(end + timedelta(days=1), time.min)))
+
+    async with open_read_session() as session:
+        result = await session.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for partition in result.mappings().partitions():
+            yield [dict(row) for row in partition]
+
+
+async def export_ndjson(rows: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+    async for batch in rows:
+        yield "".join(json.dumps(row, default=str) + "\n" for row in batch).encode()
+
+
+async def export_csv(rows: AsyncIterator[list[dict]], columns: list[str]) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns)
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+
+    async for batch in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(batch)
+        yield buffer.getvalue().encode()
+
+
+def export_stream(
+    source: str,
+    fmt: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> AsyncIterator[bytes]:
+    rows = stream_rows(source, start, end)
+    if fmt == "csv":
+        model, _ = EXPORT_SOURCES[source]
+        return export_csv(rows, [column.name for column in model.__table__.columns])
+    return export_ndjson(rows)
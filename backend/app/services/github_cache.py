@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Awaitable, Callable, Optional
+
+from app.core.config import Settings
+from app.core.versions import bump_version
+from app.services.github_service import (
+    GitHubUnavailableError,
+    get_fallback_repos,
+    load_github_repos,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RepoSnapshotCache:
+    """Enriched repo list with TTL, stale-while-revalidate and single-flight loads.
+
+    Fresh snapshots are served directly. Once the TTL passes the old snapshot
+    keeps being served for up to ``max_stale`` seconds while one background
+    task refreshes it. Cold callers share a single upstream request.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Awaitable[list[dict]]],
+        ttl: float = 300,
+        max_stale: float = 3600
+    ):
+        self._loader = loader
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._repos: Optional[list[dict]] = None
+        self._loaded_at = 0.0
+        self._retry_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        self.version = 0
+        self.counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "backoff_hits": 0,
+            "refreshes": 0,
+            "refresh_errors": 0
+        }
+
+    async def get(self) -> list[dict]:
+        if self._repos is not None:
+            age = time.monotonic() - self._loaded_at
+            if age < self.ttl:
+                self.counters["hits"] += 1
+                return self._repos
+            if age < self.ttl + self.max_stale:
+                self.counters["stale_hits"] += 1
+                if time.monotonic() >= self._retry_at:
+                    self._start_refresh()
+                return self._repos
+
+        self.counters["misses"] += 1
+        if time.monotonic() < self._retry_at and not self._refreshing:
+            # The last load failed recently; answer without waiting on
+            # GitHub again until the retry time passes.
+            self.counters["backoff_hits"] += 1
+            return self._repos if self._repos is not None else get_fallback_repos()
+
+        try:
+            return await asyncio.shield(self._start_refresh())
+        except GitHubUnavailableError:
+            if self._repos is not None:
+                return self._repos
+            return get_fallback_repos()
+
+    def peek(self) -> Optional[list[dict]]:
+        """The last loaded snapshot, however old, without touching GitHub."""
+        return self._repos
+
+    async def refresh(self) -> list[dict]:
+        return await asyncio.shield(self._start_refresh())
+
+    async def close(self) -> None:
+        """Cancel a refresh still running so it does not outlive the event loop."""
+        task, self._inflight = self._inflight, None
+        if task is not None and not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "version": self.version,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 3) if self._repos is not None else None,
+            "size": len(self._repos) if self._repos is not None else 0
+        }
+
+    @property
+    def _refreshing(self) -> bool:
+        return self._inflight is not None and not self._inflight.done()
+
+    def _start_refresh(self) -> asyncio.Task:
+        if self._refreshing:
+            self.counters["coalesced"] += 1
+            return self._inflight
+
+        self._inflight = asyncio.create_task(self._refresh())
+        self._inflight.add_done_callback(_consume_exception)
+        return self._inflight
+
+    async def _refresh(self) -> list[dict]:
+        self.counters["refreshes"] += 1
+        try:
+            repos = await self._loader()
+        except GitHubUnavailableError as e:
+            self.counters["refresh_errors"] += 1
+            self._retry_at = time.monotonic() + min(self.ttl, 30)
+            logger.warning("GitHub repo refresh failed: %s", e)
+            raise
+
+        if repos != self._repos:
+            self.version += 1
+            bump_version("github_repos")
+        self._repos = repos
+        self._loaded_at = time.monotonic()
+        return repos
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+repo_cache = RepoSnapshotCache(loader=load_github_repos)
+
+
+def configure_repo_cache(settings: Settings) -> None:
+    repo_cache.ttl = settings.github_cache_ttl
+    repo_cache.max_stale = settings.github_cache_max_stale
+
+
+async def get_github_repos() -> list[dict]:
+    return await repo_cache.get()
@@ -1,34 +1,192 @@
+import asyncio
 import httpx
-from typing import Optional
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlparse
 
 from app.core.config import get_settings
+from app.core.http import get_http_client
+from app.core.metrics import observe_upstream
 
-settings = get_settings()
+
+GITHUB_PAGE_SIZE = 100
+
+
+class GitHubUnavailableError(Exception):
+    pass
+
+
+@dataclass
+class CachedPage:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    last_page: int
+    repos: list[dict]
+
+
+_page_cache: dict[int, CachedPage] = {}
+_languages_cache: dict[str, tuple[Optional[str], dict[str, int]]] = {}
 
 
 async def fetch_github_repos() -> list[dict]:
-    headers = {"Accept": "application/vnd.github.v3+json"}
+    try:
+        return await load_github_repos()
+    except GitHubUnavailableError:
+        return get_fallback_repos()
+
+
+async def load_github_repos() -> list[dict]:
+    # Anything that goes wrong upstream, including a malformed payload,
+    # surfaces as GitHubUnavailableError so callers fall back and back off.
+    try:
+        return await _load_github_repos()
+    except GitHubUnavailableError:
+        raise
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise GitHubUnavailableError(f"Malformed GitHub response: {e!r}") from e
+
+
+async def _load_github_repos() -> list[dict]:
+    first_page = await fetch_repos_page(1)
+    
+    remaining = await asyncio.gather(
+        *(fetch_repos_page(page) for page in range(2, first_page.last_page + 1))
+    )
+    for page in [p for p in _page_cache if p > first_page.last_page]:
+        del _page_cache[page]
+    
+    repos = [repo for page in (first_page, *remaining) for repo in page.repos]
+    important_repos = [repo for repo in repos if is_important_repo(repo)]
+    
+    semaphore = asyncio.Semaphore(get_settings().github_languages_concurrency)
+    language_bytes = await asyncio.gather(
+        *(fetch_repo_languages(repo, semaphore) for repo in important_repos)
+    )
+    return [
+        enrich_repo(repo, languages)
+        for repo, languages in zip(important_repos, language_bytes)
+    ]
+
+
+async def fetch_repos_page(page: int) -> CachedPage:
+    settings = get_settings()
+    headers = github_headers()
+    cached = _page_cache.get(page)
+    if cached and cached.etag:
+        headers["If-None-Match"] = cached.etag
+    elif cached and cached.last_modified:
+        headers["If-Modified-Since"] = cached.last_modified
+    
+    try:
+        with observe_upstream("github", "repos_page") as call:
+            response = await get_http_client().get(
+                f"{settings.github_api_base}/users/{settings.github_username}/repos",
+                params={"per_page": GITHUB_PAGE_SIZE, "sort": "updated", "page": page},
+                headers=headers
+            )
+            call.status = response.status_code
+    except httpx.HTTPError as e:
+        raise GitHubUnavailableError(str(e)) from e
+    
+    if response.status_code == 304 and cached:
+        if "last" in response.links:
+            cached.last_page = last_page_number(response)
+        return cached
+    
+    if response.status_code != 200:
+        raise GitHubUnavailableError(f"GitHub responded with {response.status_code}")
     
-    if settings.github_token:
-        headers["Authorization"] = f"Bearer {settings.github_token}"
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{settings.github_api_base}/users/{settings.github_username}/repos",
-            params={"per_page": 100, "sort": "updated"},
-            headers=headers,
-            timeout=30.0
-        )
-        if response.status_code != 200:
-            return get_fallback_repos()
-        
+    try:
         repos = response.json()
-        important_repos = [repo for repo in repos if is_important_repo(repo)]
-        return [enrich_repo(repo) for repo in important_repos]
+    except ValueError as e:
+        raise GitHubUnavailableError("GitHub returned invalid JSON") from e
+    if not isinstance(repos, list):
+        raise GitHubUnavailableError("GitHub returned an unexpected repos payload")
+    
+    fetched = CachedPage(
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        last_page=last_page_number(response) if page == 1 else page,
+        repos=repos
+    )
+    _page_cache[page] = fetched
+    return fetched
+
+
+async def fetch_repo_languages(repo: dict, semaphore: asyncio.Semaphore) -> dict[str, int]:
+    settings = get_settings()
+    full_name = repo.get("full_name") or f"{settings.github_username}/{repo['name']}"
+    pushed_at = repo.get("pushed_at")
+    
+    cached = _languages_cache.get(full_name)
+    if cached and cached[0] == pushed_at:
+        return cached[1]
+    stale = cached[1] if cached else {}
+    
+    async with semaphore:
+        try:
+            with observe_upstream("github", "languages") as call:
+                response = await get_http_client().get(
+                    f"{settings.github_api_base}/repos/{full_name}/languages",
+                    headers=github_headers()
+                )
+                call.status = response.status_code
+        except httpx.HTTPError:
+            return stale
+    
+    if response.status_code != 200:
+        return stale
+    
+    try:
+        byte_counts = {lang: int(count) for lang, count in response.json().items()}
+    except (AttributeError, TypeError, ValueError):
+        return stale
+    _languages_cache[full_name] = (pushed_at, byte_counts)
+    return byte_counts
+
+
+def language_percentages(byte_counts: dict[str, int]) -> dict[str, float]:
+    total = sum(byte_counts.values())
+    if not total:
+        return {}
+    return {lang: round(count * 100 / total, 2) for lang, count in byte_counts.items()}
+
+
+def aggregate_languages(language_bytes: Iterable[Optional[dict]], limit: int = 10) -> list[dict]:
+    totals: dict[str, int] = {}
+    for repo_bytes in language_bytes:
+        for lang, count in (repo_bytes or {}).items():
+            totals[lang] = totals.get(lang, 0) + count
+    
+    grand_total = sum(totals.values())
+    ranked = sorted(totals.items(), key=lambda x: -x[1])[:limit]
+    return [
+        {"name": lang, "bytes": count, "percentage": round(count * 100 / grand_total, 2)}
+        for lang, count in ranked
+    ]
+
+
+def github_headers() -> dict:
+    headers = {"Accept": "application/vnd.github.v3+json"}
+    
+    github_token = get_settings().github_token
+    if github_token:
+        headers["Authorization"] = f"Bearer {github_token}"
+    return headers
+
+
+def last_page_number(response: httpx.Response) -> int:
+    last = response.links.get("last")
+    if not last:
+        return 1
+    
+    page = parse_qs(urlparse(last["url"]).query).get("page", ["1"])[0]
+    return int(page) if page.isdigit() else 1
 
 
-def enrich_repo(repo: dict) -> dict:
+def enrich_repo(repo: dict, language_bytes: Optional[dict[str, int]] = None) -> dict:
     name = repo["name"]
+    language_bytes = language_bytes or {}
     return {
         "github_id": str(repo["id"]),
         "name": name,
@@ -37,6 +195,8 @@ def enrich_repo(repo: dict) -> dict:
         "github_url": repo["html_url"],
         "live_url": repo.get("homepage"),
         "primary_language": repo.get("language"),
+        "languages": language_percentages(language_bytes),
+        "language_bytes": language_bytes,
         "topics": repo.get("topics", []),
         "stars_count": repo.get("stargazers_count", 0),
         "forks_count": repo.get("forks_count", 0),
@@ -0,0 +1,75 @@
+import hashlib
+import math
+import zlib
+from typing import Iterable, Optional
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality sketch.
+
+    With ``precision`` p the sketch keeps m = 2**p one-byte registers and
+    estimates distinct counts with a relative standard error of about
+    1.04 / sqrt(m): roughly 1.6% at the default p = 12 (4 KiB, usually a
+    few hundred bytes once compressed). Sketches with the same precision
+    merge losslessly by taking the register-wise maximum, so the unique
+    count of any range of days is the count of their merged sketches.
+    """
+
+    def __init__(self, precision: int = 12, registers: Optional[bytes] = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be between 4 and 16")
+        self.precision = precision
+        self.m = 1 << precision
+        if registers is not None and len(registers) != self.m:
+            raise ValueError("Register count does not match precision")
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.m)
+
+    @property
+    def standard_error(self) -> float:
+        return 1.04 / math.sqrt(self.m)
+
+    def add(self, value: str) -> None:
+        digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+        x = int.from_bytes(digest, "big")
+        index = x >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        w = x & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - w.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self) -> int:
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        return cls(precision=data[0], registers=zlib.decompress(data[1:]))
+
+    @classmethod
+    def merged(cls, sketches: Iterable[Optional[bytes]], precision: int = 12) -> "HyperLogLog":
+        loaded = [cls.from_bytes(data) for data in sketches if data]
+        if not loaded:
+            return cls(precision)
+        if any(sketch.precision != loaded[0].precision for sketch in loaded):
+            raise ValueError("Cannot merge sketches with different precision")
+        if len(loaded) == 1:
+            return loaded[0]
+        registers = bytes(map(max, *(sketch.registers for sketch in loaded)))
+        return cls(loaded[0].precision, registers)
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.core.versions import bump_version
+from app.models.portfolio import Project
+from app.services.github_cache import repo_cache
+from app.services.github_service import GitHubUnavailableError
+
+logger = logging.getLogger(__name__)
+
+PROJECT_FIELDS = (
+    "name",
+    "display_name",
+    "description",
+    "github_url",
+    "live_url",
+    "primary_language",
+    "languages",
+    "language_bytes",
+    "topics",
+    "stars_count",
+    "forks_count",
+    "is_forked",
+    "is_featured",
+    "category"
+)
+
+UPSERT_BATCH_SIZE = 200
+
+_synced_snapshot_version: Optional[int] = None
+
+
+def project_row(repo: dict) -> dict:
+    row = {"github_id": repo["github_id"]}
+    for field in PROJECT_FIELDS:
+        if field in repo:
+            row[field] = repo[field]
+    return row
+
+
+async def sync_projects(db_session: AsyncSession, repos: list[dict]) -> dict:
+    rows = [project_row(repo) for repo in repos]
+
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        batch = rows[start:start + UPSERT_BATCH_SIZE]
+        columns = [field for field in PROJECT_FIELDS if field in batch[0]]
+        stmt = dialect_insert(Project).values(batch)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Project.github_id],
+            set_={
+                **{column: stmt.excluded[column] for column in columns},
+                "updated_at": func.now()
+            }
+        )
+        await db_session.execute(stmt)
+
+    github_ids = [row["github_id"] for row in rows]
+    result = await db_session.execute(
+        delete(Project).where(Project.github_id.notin_(github_ids))
+    )
+
+    return {"upserted": len(rows), "deleted": result.rowcount or 0}
+
+
+async def run_project_sync() -> Optional[dict]:
+    global _synced_snapshot_version
+    try:
+        repos = await repo_cache.refresh()
+    except GitHubUnavailableError:
+        return None
+
+    if not repos or repo_cache.version == _synced_snapshot_version:
+        return None
+
+    async with AsyncSessionLocal() as session:
+        summary = await sync_projects(session, repos)
+        await session.commit()
+
+    _synced_snapshot_version = repo_cache.version
+    bump_version("projects")
+
+    logger.info("Project sync: %(upserted)d upserted, %(deleted)d deleted", summary)
+    return summary
+
+
+async def project_sync_loop(interval: float) -> None:
+    while True:
+        try:
+            await run_project_sync()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Project sync failed")
+        await asyncio.sleep(interval)
+
+
+async def list_projects(
+    db_session: AsyncSession,
+    category: Optional[str] = None,
+    featured_only: bool = False
+) -> list:
+    query = select(Project).order_by(Project.stars_count.desc(), Project.name)
+    if category:
+        query = query.where(Project.category == category)
+    if featured_only:
+        query = query.where(Project.is_featured == True)
+
+    result = await db_session.execute(query)
+    projects = list(result.scalars().all())
+    repos = repo_cache.peek()
+    if projects or not repos:
+        return projects
+    # An unfiltered query that came back empty already proves the table is
+    # empty; only a filtered one needs the extra check.
+    if (category or featured_only) and await has_synced_projects(db_session):
+        return projects
+
+    # Before the first sync, serve whatever snapshot is already in memory
+    # rather than waiting on GitHub; project_sync_loop fills the table.
+    if category:
+        repos = [r for r in repos if r.get("category") == category]
+    if featured_only:
+        repos = [r for r in repos if r.get("is_featured")]
+    return repos
+
+
+async def has_synced_projects(db_session: AsyncSession) -> bool:
+    return await db_session.scalar(select(Project.id).limit(1)) is not None
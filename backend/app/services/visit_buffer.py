@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import insert
+
+from app.core.config import Settings
+from app.core.database import AsyncSessionLocal
+from app.models.portfolio import VisitorLog
+from app.models.user import ProfileVisitor
+from app.services.visit_counter import (
+    PROFILE_VISITS,
+    PROFILE_VISITS_AUTHENTICATED,
+    add_unique_profile_visitors,
+    apply_unique_visitors,
+    visit_counter,
+)
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+VISIT_TABLES = {
+    "visitor_logs": VisitorLog,
+    "profile_visitors": ProfileVisitor
+}
+
+
+@dataclass
+class VisitEvent:
+    table: str
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    referrer: Optional[str]
+    page_visited: str = "/"
+    user_id: Optional[int] = None
+    visited_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def visit_date(self) -> date:
+        return self.visited_at.date()
+
+    def row(self) -> dict:
+        row = asdict(self)
+        del row["table"]
+        if self.table != "profile_visitors":
+            del row["user_id"]
+        return row
+
+
+class VisitWriteBuffer:
+    """Write-behind queue for visit events.
+
+    Requests enqueue events and return immediately; a single background
+    task flushes them with multi-row inserts once ``batch_size`` events are
+    waiting or ``flush_interval`` seconds have passed. When the queue is
+    full the configured overflow policy decides whether to drop the new
+    event, drop the oldest one, or make the caller wait. A batch whose
+    flush fails is retried with exponential backoff while new events keep
+    queueing behind it; after ``max_retries`` failed attempts it is dropped
+    and counted in ``counters["dropped"]``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        overflow_policy: str = "drop_newest",
+        max_retries: int = 5,
+        retry_backoff: float = 0.5
+    ):
+        self.configure(max_size, batch_size, flush_interval, overflow_policy, max_retries, retry_backoff)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+        self.counters = {
+            "accepted": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "flush_errors": 0,
+            "flush_retries": 0
+        }
+
+    def configure(
+        self,
+        max_size: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow_policy: str,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown visit buffer overflow policy: {overflow_policy}")
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def submit(self, event: VisitEvent) -> bool:
+        if not self.running or self._closing:
+            if not await self.flush([event]):
+                self.counters["dropped"] += 1
+                return False
+            return True
+
+        if self.overflow_policy == "block":
+            await self._queue.put(event)
+        elif self._queue.full() and self.overflow_policy == "drop_oldest":
+            self._queue.get_nowait()
+            self._queue.put_nowait(event)
+            self.counters["dropped"] += 1
+        else:
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self.counters["dropped"] += 1
+                return False
+
+        self.counters["accepted"] += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "running": self.running
+        }
+
+    async def flush(self, events: list[VisitEvent]) -> bool:
+        rows_by_table: dict[str, list[dict]] = {}
+        ips_by_day: dict[date, set[str]] = {}
+        profile_ips: set[str] = set()
+        profile_amounts = {PROFILE_VISITS: 0, PROFILE_VISITS_AUTHENTICATED: 0}
+        for event in events:
+            rows_by_table.setdefault(event.table, []).append(event.row())
+            if event.table == "profile_visitors":
+                profile_amounts[PROFILE_VISITS] += 1
+                if event.user_id is not None:
+                    profile_amounts[PROFILE_VISITS_AUTHENTICATED] += 1
+                if event.ip_address:
+                    profile_ips.add(event.ip_address)
+            elif event.ip_address:
+                ips_by_day.setdefault(event.visit_date, set()).add(event.ip_address)
+
+        async with visit_counter.lock:
+            pending_counts = visit_counter.take_pending()
+            try:
+                async with AsyncSessionLocal() as session:
+                    for table, rows in rows_by_table.items():
+                        await session.execute(insert(VISIT_TABLES[table]), rows)
+                    counts, totals = await visit_counter.apply(session, pending_counts)
+                    totals.update(await visit_counter.add_totals(
+                        session,
+                        {key: amount for key, amount in profile_amounts.items() if amount}
+                    ))
+                    await apply_unique_visitors(session, ips_by_day)
+                    if profile_ips:
+                        await add_unique_profile_visitors(session, profile_ips)
+                    await session.commit()
+            except Exception:
+                visit_counter.restore(pending_counts)
+                self.counters["flush_errors"] += 1
+                logger.exception("Failed to flush %d visit events", len(events))
+                return False
+
+            visit_counter.mark_persisted(counts, totals)
+
+        self.counters["flushes"] += 1
+        self.counters["flushed"] += len(events)
+        return True
+
+    async def flush_with_retry(self, events: list[VisitEvent]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.counters["flush_retries"] += 1
+                await asyncio.sleep(min(self.retry_backoff * 2 ** (attempt - 1), 30))
+            if await self.flush(events):
+                return True
+
+        self.counters["dropped"] += len(events)
+        logger.error(
+            "Dropped %d visit events after %d failed flush attempts",
+            len(events), self.max_retries + 1
+        )
+        return False
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            event = await self._queue.get()
+            if event is None:
+                break
+
+            batch = [event]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    stopping = True
+                    break
+                batch.append(event)
+
+            await self.flush_with_retry(batch)
+
+        remaining = []
+        while not self._queue.empty():
+            event = self._queue.get_nowait()
+            if event is not None:
+                remaining.append(event)
+        for start in range(0, len(remaining), self.batch_size):
+            await self.flush_with_retry(remaining[start:start + self.batch_size])
+
+
+visit_buffer = VisitWriteBuffer()
+
+
+def configure_visit_buffer(settings: Settings) -> None:
+    visit_buffer.configure(
+        max_size=settings.visit_buffer_max_size,
+        batch_size=settings.visit_buffer_batch_size,
+        flush_interval=settings.visit_buffer_flush_interval,
+        overflow_policy=settings.visit_buffer_overflow,
+        max_retries=settings.visit_buffer_max_retries,
+        retry_backoff=settings.visit_buffer_retry_backoff
+    )
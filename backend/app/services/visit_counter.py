@@ -0,0 +1,347 @@
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import Connection, literal, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import AsyncSessionLocal, dialect_insert
+from app.core.versions import bump_version
+from app.models.portfolio import VisitorLog, VisitorStats, VisitorTotal
+from app.models.user import ProfileVisitor
+from app.services.hyperloglog import HyperLogLog
+
+logger = logging.getLogger(__name__)
+
+ALL_TIME = "all"
+PROFILE_VISITS = "profile_visits"
+PROFILE_VISITS_AUTHENTICATED = "profile_visits_authenticated"
+
+
+def utc_today() -> date:
+    """The current UTC date; visit rows are stamped in UTC, so days are too."""
+    return datetime.utcnow().date()
+
+
+def periods_for(day: date) -> tuple[str, str, str]:
+    return ALL_TIME, day.strftime("%Y"), day.strftime("%Y-%m")
+
+
+def expected_total(period: str):
+    """SQL expression recomputing a ``visitor_totals`` row from its sources."""
+    if period == PROFILE_VISITS:
+        return select(func.count(ProfileVisitor.id)).scalar_subquery()
+    if period == PROFILE_VISITS_AUTHENTICATED:
+        return select(func.count(ProfileVisitor.user_id)).scalar_subquery()
+
+    query = select(func.coalesce(func.sum(VisitorStats.visit_count), 0))
+    if period == ALL_TIME:
+        return query.scalar_subquery()
+    try:
+        if len(period) == 4:
+            start, end = date(int(period), 1, 1), date(int(period) + 1, 1, 1)
+        else:
+            year, month = map(int, period.split("-"))
+            start = date(year, month, 1)
+            end = date(year + month // 12, month % 12 + 1, 1)
+    except ValueError:
+        return literal(0)
+    return query.where(
+        VisitorStats.visit_date >= start,
+        VisitorStats.visit_date < end
+    ).scalar_subquery()
+
+
+class DailyVisitCounter:
+    """In-process aggregation of ``VisitorStats.visit_count`` increments.
+
+    The hot path only bumps an in-memory counter. Pending increments are
+    applied by the visit buffer with one atomic
+    ``INSERT ... ON CONFLICT DO UPDATE SET visit_count = visit_count + n``
+    per day, and the same batch is added to the all-time, yearly and
+    monthly rollups in ``visitor_totals`` (which also carries the
+    profile-visit counters). The RETURNING values refresh the known
+    persisted counts, so totals are read in O(1).
+
+    The counts live in this process and only move when it flushes, so the
+    API supports a single worker: with several, each one reports the
+    totals as of its own last flush and misses the others' visits since.
+    """
+
+    def __init__(self):
+        self._pending: dict[date, int] = {}
+        self._persisted: dict[date, int] = {}
+        self._totals: dict[str, int] = {}
+        self.lock = asyncio.Lock()
+
+    def increment(self, day: Optional[date] = None, amount: int = 1) -> int:
+        day = day or utc_today()
+        self._pending[day] = self._pending.get(day, 0) + amount
+        bump_version("visitors")
+        return self.count(day)
+
+    def count(self, day: Optional[date] = None) -> int:
+        day = day or utc_today()
+        return self._persisted.get(day, 0) + self._pending.get(day, 0)
+
+    def total(self, period: str = ALL_TIME) -> int:
+        pending = sum(
+            amount for day, amount in self._pending.items()
+            if period in periods_for(day)
+        )
+        return self._totals.get(period, 0) + pending
+
+    def take_pending(self) -> dict[date, int]:
+        pending, self._pending = self._pending, {}
+        return pending
+
+    def restore(self, pending: dict[date, int]) -> None:
+        for day, amount in pending.items():
+            self._pending[day] = self._pending.get(day, 0) + amount
+
+    def mark_persisted(self, counts: dict[date, int], totals: dict[str, int]) -> None:
+        today = utc_today()
+        self._persisted = {
+            day: count for day, count in {**self._persisted, **counts}.items()
+            if day >= today
+        }
+        self._totals.update(totals)
+        bump_version("visitors")
+
+    async def apply(
+        self,
+        db_session: AsyncSession,
+        pending: dict[date, int]
+    ) -> tuple[dict[date, int], dict[str, int]]:
+        counts = {}
+        period_amounts: dict[str, int] = {}
+        for day, amount in pending.items():
+            stmt = dialect_insert(VisitorStats).values(
+                visit_date=day,
+                visit_count=amount,
+                unique_visitors=0
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[VisitorStats.visit_date],
+                set_={
+                    "visit_count": VisitorStats.visit_count + stmt.excluded.visit_count,
+                    "updated_at": func.now()
+                }
+            ).returning(VisitorStats.visit_count)
+            counts[day] = await db_session.scalar(stmt)
+
+            for period in periods_for(day):
+                period_amounts[period] = period_amounts.get(period, 0) + amount
+
+        return counts, await self.add_totals(db_session, period_amounts)
+
+    async def add_totals(self, db_session: AsyncSession, amounts: dict[str, int]) -> dict[str, int]:
+        totals = {}
+        for period, amount in amounts.items():
+            stmt = dialect_insert(VisitorTotal).values(period=period, total=amount)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[VisitorTotal.period],
+                set_={
+                    "total": VisitorTotal.total + stmt.excluded.total,
+                    "updated_at": func.now()
+                }
+            ).returning(VisitorTotal.total)
+            totals[period] = await db_session.scalar(stmt)
+        return totals
+
+    async def load(self, db_session: AsyncSession, day: Optional[date] = None) -> None:
+        day = day or utc_today()
+        count = await db_session.scalar(
+            select(VisitorStats.visit_count).where(VisitorStats.visit_date == day)
+        )
+        self._persisted[day] = count or 0
+
+        result = await db_session.execute(select(VisitorTotal.period, VisitorTotal.total))
+        self._totals = {period: total for period, total in result.all()}
+
+    async def reconcile(self, db_session: AsyncSession) -> dict[str, tuple[int, int]]:
+        # Lock the rollup rows before recomputing them. A flush bumps
+        # visitor_stats and then visitor_totals in one transaction, so on
+        # Postgres it either finishes before the lock is granted (and its
+        # visits are in the sums below) or waits for this transaction and
+        # adds its visits on top of the corrected totals.
+        result = await db_session.execute(
+            select(VisitorTotal.period, VisitorTotal.total).with_for_update()
+        )
+        stored = {period: total for period, total in result.all()}
+
+        days = await db_session.scalars(select(VisitorStats.visit_date))
+        periods = {ALL_TIME, PROFILE_VISITS, PROFILE_VISITS_AUTHENTICATED} | stored.keys()
+        for day in days:
+            periods.update(periods_for(day))
+
+        totals, mismatches = {}, {}
+        for period in sorted(periods):
+            # Recompute and write in one statement so no flush can commit
+            # between reading the source rows and overwriting the total.
+            stmt = dialect_insert(VisitorTotal).values(period=period, total=expected_total(period))
+            total = await db_session.scalar(stmt.on_conflict_do_update(
+                index_elements=[VisitorTotal.period],
+                set_={"total": stmt.excluded.total, "updated_at": func.now()},
+                where=VisitorTotal.total != stmt.excluded.total
+            ).returning(VisitorTotal.total))
+            before = stored.get(period, 0)
+            totals[period] = before if total is None else total
+            if totals[period] != before:
+                mismatches[period] = (before, totals[period])
+
+        self._totals = totals
+        bump_version("visitors")
+        return mismatches
+
+
+visit_counter = DailyVisitCounter()
+
+
+async def reconcile_visitor_totals() -> dict[str, tuple[int, int]]:
+    async with visit_counter.lock:
+        async with AsyncSessionLocal() as session:
+            mismatches = await visit_counter.reconcile(session)
+            await session.commit()
+
+    for period, (stored, expected) in mismatches.items():
+        logger.warning(
+            "Visitor total for %s drifted: rollup=%d, visitor_stats=%d; corrected",
+            period, stored, expected
+        )
+    return mismatches
+
+
+async def visitor_reconcile_loop(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_visitor_totals()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Visitor totals reconciliation failed")
+
+
+async def apply_unique_visitors(db_session: AsyncSession, ips_by_day: dict[date, set[str]]) -> None:
+    for day, ips in ips_by_day.items():
+        await db_session.execute(
+            dialect_insert(VisitorStats)
+            .values(visit_date=day, visit_count=0, unique_visitors=0)
+            .on_conflict_do_nothing(index_elements=[VisitorStats.visit_date])
+        )
+        stored = await db_session.scalar(
+            select(VisitorStats.unique_sketch)
+            .where(VisitorStats.visit_date == day)
+            .with_for_update()
+        )
+        sketch = HyperLogLog.from_bytes(stored) if stored else HyperLogLog()
+        sketch.update(ips)
+        await db_session.execute(
+            update(VisitorStats)
+            .where(VisitorStats.visit_date == day)
+            .values(unique_sketch=sketch.to_bytes(), unique_visitors=sketch.count())
+        )
+
+
+async def add_unique_profile_visitors(db_session: AsyncSession, ips: set[str]) -> None:
+    """Fold profile-visit ``ips`` into the sketch on the ``profile_visits`` rollup row.
+
+    This is the population the all-time unique visitor count has always
+    described (distinct ``profile_visitors`` IPs), kept apart from the
+    daily sketches, which count ``visitor_logs`` IPs. A row without a
+    sketch yet is seeded from ``profile_visitors`` once.
+    """
+    await db_session.execute(
+        dialect_insert(VisitorTotal)
+        .values(period=PROFILE_VISITS, total=0)
+        .on_conflict_do_nothing(index_elements=[VisitorTotal.period])
+    )
+    stored = await db_session.scalar(
+        select(VisitorTotal.unique_sketch)
+        .where(VisitorTotal.period == PROFILE_VISITS)
+        .with_for_update()
+    )
+    if stored:
+        sketch = HyperLogLog.from_bytes(stored)
+    else:
+        sketch = HyperLogLog()
+        result = await db_session.stream_scalars(
+            select(ProfileVisitor.ip_address)
+            .where(ProfileVisitor.ip_address.isnot(None))
+            .execution_options(yield_per=5000)
+        )
+        async for ip_address in result:
+            sketch.add(ip_address)
+    sketch.update(ips)
+    await db_session.execute(
+        update(VisitorTotal)
+        .where(VisitorTotal.period == PROFILE_VISITS)
+        .values(unique_sketch=sketch.to_bytes())
+    )
+
+
+async def ensure_profile_visitor_sketch() -> None:
+    async with AsyncSessionLocal() as session:
+        seeded = await session.scalar(
+            select(VisitorTotal.id).where(
+                VisitorTotal.period == PROFILE_VISITS,
+                VisitorTotal.unique_sketch.isnot(None)
+            )
+        )
+        if seeded is None:
+            await add_unique_profile_visitors(session, set())
+            await session.commit()
+
+
+def backfill_unique_sketches(connection: Connection) -> int:
+    """Build ``VisitorStats.unique_sketch`` from the stored visit logs.
+
+    Runs once, inside the schema upgrade that adds the column, so days
+    recorded before sketches existed still count towards unique visitors.
+    Like ``visit_count``, the daily sketches describe ``visitor_logs``.
+    """
+    sketches: dict[date, HyperLogLog] = {}
+    rows = connection.execution_options(yield_per=5000).execute(
+        select(VisitorLog.ip_address, VisitorLog.visited_at)
+        .where(VisitorLog.ip_address.isnot(None), VisitorLog.visited_at.isnot(None))
+    )
+    for ip_address, visited_at in rows:
+        sketches.setdefault(visited_at.date(), HyperLogLog()).add(ip_address)
+
+    for day, sketch in sketches.items():
+        connection.execute(
+            dialect_insert(VisitorStats)
+            .values(visit_date=day, visit_count=0, unique_visitors=0)
+            .on_conflict_do_nothing(index_elements=[VisitorStats.visit_date])
+        )
+        connection.execute(
+            update(VisitorStats)
+            .where(VisitorStats.visit_date == day)
+            .values(unique_sketch=sketch.to_bytes(), unique_visitors=sketch.count())
+        )
+    logger.info("Backfilled unique visitor sketches for %d days", len(sketches))
+    return len(sketches)
+
+
+async def estimate_unique_visitors(
+    db_session: AsyncSession,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> int:
+    query = select(VisitorStats.unique_sketch).where(VisitorStats.unique_sketch.isnot(None))
+    if start:
+        query = query.where(VisitorStats.visit_date >= start)
+    if end:
+        query = query.where(VisitorStats.visit_date <= end)
+
+    result = await db_session.execute(query)
+    return HyperLogLog.merged(result.scalars()).count()
+
+
+async def estimate_unique_profile_visitors(db_session: AsyncSession) -> int:
+    stored = await db_session.scalar(
+        select(VisitorTotal.unique_sketch).where(VisitorTotal.period == PROFILE_VISITS)
+    )
+    return HyperLogLog.from_bytes(stored).count() if stored else 0
@@ -1,51 +1,50 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select
 
 from app.models.user import ProfileVisitor
+from app.services.visit_buffer import VisitEvent, visit_buffer
+from app.services.visit_counter import (
+    PROFILE_VISITS,
+    PROFILE_VISITS_AUTHENTICATED,
+    estimate_unique_profile_visitors,
+    visit_counter,
+)
 
 
 async def track_visitor(
-    db_session: AsyncSession,
     ip_address: str | None,
     user_agent: str | None,
     referrer: str | None,
     page: str,
     user_id: int | None = None
-) -> ProfileVisitor:
-    visitor = ProfileVisitor(
+) -> bool:
+    return await visit_buffer.submit(VisitEvent(
+        table="profile_visitors",
         user_id=user_id,
         ip_address=ip_address,
         user_agent=user_agent,
         referrer=referrer,
         page_visited=page
-    )
-    db_session.add(visitor)
-    await db_session.flush()
-    return visitor
+    ))
 
 
 async def get_visitor_stats(db_session: AsyncSession) -> dict:
-    total = await db_session.scalar(select(func.count(ProfileVisitor.id)))
-    
-    unique_ips = await db_session.scalar(
-        select(func.count(func.distinct(ProfileVisitor.ip_address)))
-    )
-    
-    authenticated = await db_session.scalar(
-        select(func.count(ProfileVisitor.id)).where(ProfileVisitor.user_id.isnot(None))
-    )
-    
     recent_result = await db_session.execute(
-        select(ProfileVisitor)
+        select(
+            ProfileVisitor.ip_address,
+            ProfileVisitor.page_visited,
+            ProfileVisitor.visited_at,
+            ProfileVisitor.user_id
+        )
         .order_by(ProfileVisitor.visited_at.desc())
         .limit(10)
     )
-    recent = recent_result.scalars().all()
+    recent = recent_result.all()
     
     return {
-        "total_visitors": total or 0,
-        "unique_visitors": unique_ips or 0,
-        "authenticated_visitors": authenticated or 0,
+        "total_visitors": visit_counter.total(PROFILE_VISITS),
+        "unique_visitors": await estimate_unique_profile_visitors(db_session),
+        "authenticated_visitors": visit_counter.total(PROFILE_VISITS_AUTHENTICATED),
         "recent_visitors": [
             {
                 "ip": v.ip_address,
@@ -0,0 +1,336 @@
+"""Throughput and latency for every API router, driven in-process over ASGI.
+
+For each ``--sizes`` entry a worker process seeds a fresh database with that
+many profile visits (plus visitor logs, contact messages and users), starts
+the app against local GitHub and Clerk stand-ins and hits each endpoint
+with ``--requests`` requests at every ``--concurrency`` level. Results go to
+``--output`` as JSON so runs from two commits can be diffed::
+
+    cd backend
+    python -m benchmarks.endpoints --sizes 1000,100000 --concurrency 1,16,64
+    python -m benchmarks.endpoints --baseline results-main.json --output results-branch.json
+
+SQLite databases are created in a temp directory. ``--database-url`` points
+the run at a Postgres database instead; its tables are dropped and
+recreated for every size.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ENDPOINTS = (
+    ("GET", "/health", None, None),
+    ("GET", "/api/v1/portfolio/profile", None, None),
+    ("GET", "/api/v1/portfolio/skills", None, None),
+    ("GET", "/api/v1/portfolio/experience", None, None),
+    ("GET", "/api/v1/portfolio/certificates", None, None),
+    ("GET", "/api/v1/portfolio/projects", None, None),
+    ("GET", "/api/v1/portfolio/projects?category=backend", None, None),
+    ("GET", "/api/v1/portfolio/projects/featured", None, None),
+    ("GET", "/api/v1/portfolio/stats", None, None),
+    ("POST", "/api/v1/portfolio/track-visit", None, "user"),
+    ("POST", "/api/v1/visitors/track", None, None),
+    ("GET", "/api/v1/visitors/count", None, None),
+    ("GET", "/api/v1/visitors/stats", None, None),
+    ("POST", "/api/v1/contact/submit", {
+        "sender_name": "Bench Sender",
+        "sender_email": "sender@example.com",
+        "subject": "Benchmark message",
+        "message_body": "Sent by the endpoint benchmark. " * 3
+    }, "user"),
+    ("GET", "/api/v1/contact/messages?limit=20", None, None),
+    ("GET", "/api/v1/contact/messages/count", None, None),
+    ("GET", "/api/v1/exports/contact-messages", None, "admin"),
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,100000", help="comma-separated profile visit counts")
+    parser.add_argument("--concurrency", default="1,16,64", help="comma-separated client concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="requests per endpoint and concurrency level")
+    parser.add_argument("--repos", type=int, default=60, help="repositories served by the GitHub stand-in")
+    parser.add_argument("--endpoints", default="", help="only run endpoints whose path contains this text")
+    parser.add_argument("--database-url", default="", help="benchmark against this (Postgres) database")
+    parser.add_argument("--output", default="", help="JSON results file (default: benchmark-<commit>.json)")
+    parser.add_argument("--baseline", default="", help="earlier results file to compare against")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--worker-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-output", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(timings: list[float], errors: int, elapsed: float) -> dict:
+    ordered = sorted(timings)
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "throughput_rps": round(len(timings) / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 50), 3),
+            "p95": round(percentile(ordered, 95), 3),
+            "p99": round(percentile(ordered, 99), 3),
+            "mean": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+            "max": round(ordered[-1], 3) if ordered else 0.0
+        }
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# ---------------------------------------------------------------------------
+# Worker: one database size per process, so caches and counters start cold.
+# ---------------------------------------------------------------------------
+
+async def run_worker(args: argparse.Namespace) -> None:
+    from benchmarks.stand_ins import (
+        CLERK_JWKS_URL,
+        GITHUB_API_BASE,
+        ClerkStandIn,
+        GitHubStandIn,
+        stand_in_transport,
+    )
+
+    import httpx
+    from sqlalchemy import insert, update
+
+    from app.core.config import Settings
+    from app.core.database import AsyncSessionLocal, Base, init_engines
+    from app.core.http import http_pool
+    from app.main import create_app, lifespan
+    from app.models.portfolio import ContactMessage, VisitorLog, VisitorStats
+    from app.models.user import ProfileVisitor, User
+    from app.services.project_service import run_project_sync
+    from app.services.visit_counter import apply_unique_visitors, reconcile_visitor_totals
+
+    settings = Settings(
+        database_url=args.database_url,
+        debug=False,
+        log_level="WARNING",
+        github_api_base=GITHUB_API_BASE,
+        clerk_jwks_url=CLERK_JWKS_URL
+    )
+    app = create_app(settings)
+    size = args.worker_size
+    github = GitHubStandIn(settings.github_username, args.repos)
+    clerk = ClerkStandIn()
+
+    async with init_engines(settings).primary.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    rng = random.Random(args.seed)
+    days = 365
+    start = datetime.utcnow() - timedelta(days=days)
+    ips_by_day: dict[date, set[str]] = {}
+    visits_by_day: dict[date, int] = {}
+    batch = 20_000
+    seed_started = time.perf_counter()
+
+    async with AsyncSessionLocal() as session:
+        await session.execute(insert(User), [
+            {"clerk_id": "bench_admin", "email": "admin@example.com", "name": "Bench Admin", "is_admin": True},
+            {"clerk_id": "bench_user", "email": "user@example.com", "name": "Bench User", "is_admin": False}
+        ])
+        for offset in range(0, size, batch):
+            visits = []
+            for _ in range(min(batch, size - offset)):
+                visited_at = start + timedelta(seconds=rng.randrange(days * 86400))
+                ip = f"10.{rng.randrange(64)}.{rng.randrange(256)}.{rng.randrange(256)}"
+                visits.append({
+                    "user_id": 2 if rng.random() < 0.1 else None,
+                    "ip_address": ip,
+                    "user_agent": "bench",
+                    "referrer": None,
+                    "page_visited": "/",
+                    "visited_at": visited_at
+                })
+                ips_by_day.setdefault(visited_at.date(), set()).add(ip)
+                visits_by_day[visited_at.date()] = visits_by_day.get(visited_at.date(), 0) + 1
+            await session.execute(insert(ProfileVisitor), visits)
+            await session.execute(insert(VisitorLog), [
+                {key: visit[key] for key in ("ip_address", "user_agent", "referrer", "page_visited", "visited_at")}
+                for visit in visits
+            ])
+        await session.execute(insert(ContactMessage), [
+            {
+                "sender_name": f"Sender {i}",
+                "sender_email": f"sender{i}@example.com",
+                "subject": f"Message {i}",
+                "message_body": "Seeded by the endpoint benchmark. " * 3,
+                "created_at": start + timedelta(seconds=rng.randrange(days * 86400))
+            }
+            for i in range(max(50, size // 20))
+        ])
+        await apply_unique_visitors(session, ips_by_day)
+        for day, count in visits_by_day.items():
+            await session.execute(
+                update(VisitorStats).where(VisitorStats.visit_date == day).values(visit_count=count)
+            )
+        await session.commit()
+    await reconcile_visitor_totals()
+    seed_seconds = time.perf_counter() - seed_started
+
+    tokens = {"user": clerk.token("bench_user"), "admin": clerk.token("bench_admin")}
+    await http_pool.start(transport=stand_in_transport(github, clerk))
+    results = []
+
+    async with lifespan(app):
+        await run_project_sync()
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for method, path, body, auth in ENDPOINTS:
+                if args.endpoints and args.endpoints not in path:
+                    continue
+                headers = {"Authorization": f"Bearer {tokens[auth]}"} if auth else {}
+
+                async def call() -> tuple[float, bool]:
+                    started = time.perf_counter()
+                    response = await client.request(method, path, json=body, headers=headers)
+                    await response.aread()
+                    return (time.perf_counter() - started) * 1000, response.status_code < 400
+
+                for _ in range(10):
+                    await call()
+
+                for concurrency in args.concurrency_levels:
+                    timings: list[float] = []
+                    errors = 0
+                    remaining = args.requests
+
+                    async def worker() -> None:
+                        nonlocal remaining, errors
+                        while remaining > 0:
+                            remaining -= 1
+                            elapsed, ok = await call()
+                            timings.append(elapsed)
+                            errors += not ok
+
+                    started = time.perf_counter()
+                    await asyncio.gather(*(worker() for _ in range(concurrency)))
+                    summary = summarize(timings, errors, time.perf_counter() - started)
+                    results.append({
+                        "size": size,
+                        "endpoint": f"{method} {path}",
+                        "concurrency": concurrency,
+                        **summary
+                    })
+                    print_row(results[-1], file=sys.stderr)
+
+    Path(args.worker_output).write_text(json.dumps({"seed_seconds": round(seed_seconds, 2), "results": results}))
+
+
+# ---------------------------------------------------------------------------
+# Driver: spawns a worker per size, merges results, compares to a baseline.
+# ---------------------------------------------------------------------------
+
+def print_row(row: dict, file=sys.stdout, baseline: dict = None) -> None:
+    latency = row["latency_ms"]
+    line = (
+        f"{row['size']:>9,} {row['endpoint']:<62} c={row['concurrency']:<4} "
+        f"{row['throughput_rps']:>9.1f} rps  p50 {latency['p50']:8.2f}  "
+        f"p95 {latency['p95']:8.2f}  p99 {latency['p99']:8.2f} ms"
+    )
+    if row["errors"]:
+        line += f"  errors={row['errors']}"
+    if baseline:
+        before = baseline["latency_ms"]["p95"]
+        change = (latency["p95"] - before) / before * 100 if before else 0.0
+        line += f"  p95 {change:+6.1f}% vs baseline"
+    print(line, file=file, flush=True)
+
+
+def run_driver(args: argparse.Namespace) -> int:
+    workdir = tempfile.mkdtemp(prefix="endpoint-bench-")
+    database = "postgresql" if args.database_url else "sqlite"
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": database,
+            "requests": args.requests,
+            "concurrency": args.concurrency_levels,
+            "sizes": args.size_list,
+            "repos": args.repos,
+            "seed": args.seed
+        },
+        "seed_seconds": {},
+        "results": []
+    }
+
+    for size in args.size_list:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{workdir}/bench-{size}.db"
+        worker_output = os.path.join(workdir, f"results-{size}.json")
+        command = [
+            sys.executable, "-m", "benchmarks.endpoints",
+            "--worker-size", str(size),
+            "--worker-output", worker_output,
+            "--database-url", database_url,
+            "--concurrency", args.concurrency,
+            "--requests", str(args.requests),
+            "--repos", str(args.repos),
+            "--endpoints", args.endpoints,
+            "--seed", str(args.seed)
+        ]
+        print(f"size {size:,} ({database})", file=sys.stderr, flush=True)
+        completed = subprocess.run(command, stdout=subprocess.DEVNULL)
+        if completed.returncode != 0:
+            print(f"worker for size {size} failed with exit code {completed.returncode}", file=sys.stderr)
+            return completed.returncode
+        worker_report = json.loads(Path(worker_output).read_text())
+        report["seed_seconds"][str(size)] = worker_report["seed_seconds"]
+        report["results"].extend(worker_report["results"])
+
+    output = args.output or f"benchmark-{report['meta']['commit']}.json"
+    Path(output).write_text(json.dumps(report, indent=2) + "\n")
+
+    baseline = {}
+    if args.baseline:
+        for row in json.loads(Path(args.baseline).read_text())["results"]:
+            baseline[(row["size"], row["endpoint"], row["concurrency"])] = row
+
+    print()
+    for row in report["results"]:
+        print_row(row, baseline=baseline.get((row["size"], row["endpoint"], row["concurrency"])))
+    print(f"\nwrote {output}")
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+    args.size_list = [int(size) for size in args.sizes.split(",") if size]
+    args.concurrency_levels = [int(level) for level in args.concurrency.split(",") if level]
+    if args.worker_size is not None:
+        asyncio.run(run_worker(args))
+        return 0
+    return run_driver(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
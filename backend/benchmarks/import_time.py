@@ -0,0 +1,108 @@
+"""Import-time budget for the app packages.
+
+Imports each module in a fresh interpreter ``--repeat`` times, reports the
+median wall time against its budget, and checks that importing
+``app.main`` builds no engines and reads no settings. Exits non-zero when
+a budget is exceeded or an import has side effects, so it can gate CI::
+
+    cd backend
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --scale 2 --top 15
+
+``--scale`` multiplies every budget for slower machines; ``--top`` lists
+the heaviest imports behind ``app.main`` from ``python -X importtime``.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Budgets in milliseconds, measured with warm bytecode caches.
+BUDGETS = {
+    "app": 50,
+    "app.core": 50,
+    "app.core.config": 400,
+    "app.models": 1000,
+    "app.main": 1500,
+}
+
+TIMER = "import time; started = time.perf_counter(); import {module}; print(time.perf_counter() - started)"
+
+SIDE_EFFECTS = """
+import sys
+import app.main
+import app.core.config as config
+import app.core.database as database
+problems = []
+if config._settings is not None:
+    problems.append("settings were read")
+if database._engines is not None:
+    problems.append("database engines were built")
+if "aiosqlite" in sys.modules or "asyncpg" in sys.modules:
+    problems.append("a database driver was imported")
+if "app" in vars(app.main):
+    problems.append("the default app was built")
+print("; ".join(problems))
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget by this factor")
+    parser.add_argument("--top", type=int, default=0, help="list the N heaviest imports behind app.main")
+    return parser.parse_args()
+
+
+def run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, check=True)
+
+
+def measure(module: str, repeat: int) -> float:
+    run(f"import {module}")  # compile bytecode before timing
+    timings = [float(run(TIMER.format(module=module)).stdout) * 1000 for _ in range(repeat)]
+    return statistics.median(timings)
+
+
+def heaviest_imports(module: str, count: int) -> list[tuple[int, str]]:
+    rows = []
+    for line in run(f"import {module}", "-X", "importtime").stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # Only direct children of the top-level import, so nothing is counted twice.
+        if len(name) - len(name.lstrip()) == 3:
+            rows.append((int(parts[1]), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main() -> int:
+    args = parse_args()
+    failed = False
+
+    print(f"{'module':<20} {'median':>10} {'budget':>10}")
+    for module, budget in BUDGETS.items():
+        budget *= args.scale
+        elapsed = measure(module, args.repeat)
+        over = elapsed > budget
+        failed |= over
+        print(f"{module:<20} {elapsed:8.1f}ms {budget:8.0f}ms{'  OVER BUDGET' if over else ''}")
+
+    problems = run(SIDE_EFFECTS).stdout.strip()
+    if problems:
+        failed = True
+        print(f"\nimporting app.main has side effects: {problems}")
+    else:
+        print("\nimporting app.main has no side effects")
+
+    if args.top:
+        print("\nheaviest imports behind app.main (cumulative):")
+        for cumulative, name in heaviest_imports("app.main", args.top):
+            print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
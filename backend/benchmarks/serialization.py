@@ -0,0 +1,115 @@
+"""Compare the default response path with FAST_JSON_RESPONSES.
+
+Seeds a throwaway SQLite database with ``--projects`` projects and some
+visitor data, then drives the app in-process through an ASGI transport
+with the fast path off and on::
+
+    cd backend
+    python -m benchmarks.serialization --projects 200 --requests 500
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=500)
+    return parser.parse_args()
+
+
+args = parse_args()
+workdir = tempfile.mkdtemp(prefix="serialization-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/bench.db"
+os.environ["DEBUG"] = "false"
+
+import httpx  # noqa: E402
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.database import AsyncSessionLocal, init_database  # noqa: E402
+from app.core.http import http_pool  # noqa: E402
+from app.core.responses import orjson  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.project_service import sync_projects  # noqa: E402
+from app.services.visit_counter import reconcile_visitor_totals  # noqa: E402
+
+ENDPOINTS = (
+    "/api/v1/portfolio/projects",
+    "/api/v1/portfolio/projects/featured",
+    "/api/v1/portfolio/stats",
+    "/api/v1/visitors/count",
+    "/api/v1/visitors/stats",
+)
+
+
+def synthetic_repo(i: int) -> dict:
+    return {
+        "github_id": str(i),
+        "name": f"project-{i}",
+        "display_name": f"Project {i}",
+        "description": "A benchmark project " * 4,
+        "github_url": f"https://github.com/example/project-{i}",
+        "live_url": None,
+        "primary_language": ("Python", "TypeScript", "C++")[i % 3],
+        "languages": {"Python": 61.5, "HTML": 20.25, "CSS": 18.25},
+        "topics": ["benchmark", "portfolio", f"topic-{i % 7}"],
+        "stars_count": i,
+        "forks_count": i // 3,
+        "is_forked": False,
+        "is_featured": i % 5 == 0,
+        "category": ("backend", "frontend", "ml_ai")[i % 3]
+    }
+
+
+def github_stand_in(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/languages"):
+        return httpx.Response(200, json={"Python": 6150, "HTML": 2025, "CSS": 1825})
+    return httpx.Response(200, json=[])
+
+
+async def seed() -> None:
+    await http_pool.start(transport=httpx.MockTransport(github_stand_in))
+    await init_database()
+    async with AsyncSessionLocal() as session:
+        await sync_projects(session, [synthetic_repo(i) for i in range(args.projects)])
+        await session.commit()
+    await reconcile_visitor_totals()
+
+
+async def run(client: httpx.AsyncClient, path: str) -> list[float]:
+    timings = []
+    for _ in range(args.requests):
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        response.raise_for_status()
+    return timings
+
+
+async def main() -> None:
+    await seed()
+    settings = get_settings()
+    transport = httpx.ASGITransport(app=app)
+    print(f"orjson: {'yes' if orjson else 'no (stdlib json fallback)'}; {args.requests} requests per endpoint")
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in ENDPOINTS:
+            results = {}
+            for fast in (False, True):
+                settings.fast_json_responses = fast
+                await client.get(path)
+                results[fast] = statistics.median(await run(client, path))
+            speedup = results[False] / results[True] if results[True] else float("inf")
+            print(
+                f"{path:<40} default {results[False]:7.3f} ms  "
+                f"fast {results[True]:7.3f} ms  x{speedup:.1f}"
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,98 @@
+"""Local stand-ins for GitHub and Clerk, served through ``httpx.MockTransport``.
+
+Install with ``await http_pool.start(transport=stand_in_transport(...))``
+before the app starts so every outbound call stays in-process.
+"""
+import re
+import time
+from typing import Optional
+
+import httpx
+import rsa
+from jose import jwk, jwt
+
+GITHUB_HOST = "api.github.bench"
+CLERK_HOST = "clerk.bench"
+GITHUB_API_BASE = f"https://{GITHUB_HOST}"
+CLERK_JWKS_URL = f"https://{CLERK_HOST}/.well-known/jwks.json"
+
+
+class GitHubStandIn:
+    """``/users/{user}/repos`` with Link pagination and ``/repos/{repo}/languages``."""
+
+    def __init__(self, username: str, repo_count: int):
+        self.username = username
+        self.repos = [self.repo(i) for i in range(repo_count)]
+
+    def repo(self, i: int) -> dict:
+        # Name stems spread repos over the backend/frontend/ml_ai categories
+        # and mark every fifth one as featured.
+        name = ("api-server", "ui-kit", "ml-model", "portfolio-site", "toolkit")[i % 5] + f"-{i}"
+        return {
+            "id": 100000 + i,
+            "name": name,
+            "full_name": f"{self.username}/{name}",
+            "description": "A benchmark project " * 4,
+            "html_url": f"https://github.com/{self.username}/{name}",
+            "homepage": None,
+            "language": ("Python", "TypeScript", "C++")[i % 3],
+            "topics": ["benchmark", "portfolio", f"topic-{i % 7}"],
+            "stargazers_count": i,
+            "forks_count": i // 3,
+            "fork": False,
+            "pushed_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:00Z"
+        }
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path.endswith("/languages"):
+            return httpx.Response(200, json={"Python": 6150, "HTML": 2025, "CSS": 1825})
+
+        if re.fullmatch(r"/users/[^/]+/repos", path):
+            per_page = int(request.url.params.get("per_page", 30))
+            page = int(request.url.params.get("page", 1))
+            last_page = max(1, -(-len(self.repos) // per_page))
+            headers = {}
+            if last_page > 1:
+                link = request.url.copy_set_param("page", last_page)
+                headers["Link"] = f'<{link}>; rel="last"'
+            start = (page - 1) * per_page
+            return httpx.Response(200, json=self.repos[start:start + per_page], headers=headers)
+
+        return httpx.Response(404, json={"message": "Not Found"})
+
+
+class ClerkStandIn:
+    """A JWKS endpoint backed by a freshly generated RSA key, plus a token minter."""
+
+    def __init__(self, kid: str = "bench-key"):
+        self.kid = kid
+        _, private_key = rsa.newkeys(2048)
+        self.private_pem = private_key.save_pkcs1().decode()
+        public = jwk.construct(self.private_pem, "RS256").public_key().to_dict()
+        self.jwks = {"keys": [{**public, "kid": kid, "use": "sig"}]}
+
+    def token(self, subject: str, email: Optional[str] = None, ttl: int = 3600) -> str:
+        claims = {
+            "sub": subject,
+            "email": email or f"{subject}@example.com",
+            "name": subject,
+            "iat": int(time.time()),
+            "exp": int(time.time()) + ttl
+        }
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=self.jwks)
+
+
+def stand_in_transport(github: GitHubStandIn, clerk: ClerkStandIn) -> httpx.MockTransport:
+    def route(request: httpx.Request) -> httpx.Response:
+        if request.url.host == GITHUB_HOST:
+            return github.handle(request)
+        if request.url.host == CLERK_HOST:
+            return clerk.handle(request)
+        return httpx.Response(502, json={"detail": f"No stand-in for {request.url.host}"})
+
+    return httpx.MockTransport(route)
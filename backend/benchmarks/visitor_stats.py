@@ -0,0 +1,115 @@
+"""Compare the legacy four-query visitor stats with the current stats engine.
+
+Seeds a throwaway SQLite database with ``--rows`` profile visits spread
+over ``--days`` days, then times both implementations::
+
+    cd backend
+    python -m benchmarks.visitor_stats --rows 1000000 --repeat 5
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--ips", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=50_000)
+    return parser.parse_args()
+
+
+args = parse_args()
+workdir = tempfile.mkdtemp(prefix="visitor-stats-bench-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/bench.db"
+os.environ["DEBUG"] = "false"
+
+from sqlalchemy import insert, select, func  # noqa: E402
+
+from app.core.database import AsyncSessionLocal, init_database  # noqa: E402
+from app.models.user import ProfileVisitor  # noqa: E402
+from app.services.hyperloglog import HyperLogLog  # noqa: E402
+from app.services.visit_counter import add_unique_profile_visitors, reconcile_visitor_totals  # noqa: E402
+from app.services.visitor_service import get_visitor_stats  # noqa: E402
+
+
+async def seed() -> None:
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=args.days)
+    ips: set[str] = set()
+
+    async with AsyncSessionLocal() as session:
+        for offset in range(0, args.rows, args.batch):
+            rows = []
+            for _ in range(min(args.batch, args.rows - offset)):
+                visited_at = start + timedelta(seconds=rng.randrange(args.days * 86400))
+                ip = f"10.{rng.randrange(args.ips) >> 8 & 255}.{rng.randrange(256)}.{rng.randrange(256)}"
+                rows.append({
+                    "user_id": rng.randrange(1000) if rng.random() < 0.1 else None,
+                    "ip_address": ip,
+                    "user_agent": "bench",
+                    "referrer": None,
+                    "page_visited": "/",
+                    "visited_at": visited_at
+                })
+                ips.add(ip)
+            await session.execute(insert(ProfileVisitor), rows)
+        await add_unique_profile_visitors(session, ips)
+        await session.commit()
+
+    await reconcile_visitor_totals()
+
+
+async def legacy_stats(db_session) -> dict:
+    total = await db_session.scalar(select(func.count(ProfileVisitor.id)))
+    unique_ips = await db_session.scalar(
+        select(func.count(func.distinct(ProfileVisitor.ip_address)))
+    )
+    authenticated = await db_session.scalar(
+        select(func.count(ProfileVisitor.id)).where(ProfileVisitor.user_id.isnot(None))
+    )
+    recent = (await db_session.execute(
+        select(ProfileVisitor).order_by(ProfileVisitor.visited_at.desc()).limit(10)
+    )).scalars().all()
+    return {"total_visitors": total, "unique_visitors": unique_ips,
+            "authenticated_visitors": authenticated, "recent": len(recent)}
+
+
+async def measure(fn) -> tuple[list[float], dict]:
+    timings = []
+    result = {}
+    for _ in range(args.repeat):
+        async with AsyncSessionLocal() as session:
+            started = time.perf_counter()
+            result = await fn(session)
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings, result
+
+
+async def main() -> None:
+    await init_database()
+    started = time.perf_counter()
+    await seed()
+    print(f"seeded {args.rows:,} rows in {time.perf_counter() - started:.1f}s ({workdir})")
+
+    for name, fn in (("legacy", legacy_stats), ("current", get_visitor_stats)):
+        timings, result = await measure(fn)
+        print(
+            f"{name:>8}: median {statistics.median(timings):8.2f} ms  "
+            f"min {min(timings):8.2f} ms  "
+            f"total={result['total_visitors']} unique={result['unique_visitors']} "
+            f"authenticated={result['authenticated_visitors']}"
+        )
+    print(f"HyperLogLog relative standard error: {HyperLogLog().standard_error:.2%}")
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+import app.core.config as config
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.config import Settings, use_settings
+from app.core.database import dispose_engines, init_database, init_engines
+from app.services import visit_buffer as visit_buffer_module
+from app.services import visit_counter as visit_counter_module
+
+
+@pytest.fixture
+def use_test_settings():
+    """Install settings for one test and put the previous ones back afterwards."""
+    previous = config._settings
+
+    def install(**overrides) -> Settings:
+        return use_settings(Settings(**overrides))
+
+    try:
+        yield install
+    finally:
+        config._settings = previous
+
+
+@pytest.fixture
+def visit_counter(monkeypatch):
+    """A fresh in-memory visit counter in place of the process-wide one."""
+    counter = visit_counter_module.DailyVisitCounter()
+    monkeypatch.setattr(visit_counter_module, "visit_counter", counter)
+    monkeypatch.setattr(visit_buffer_module, "visit_counter", counter)
+    return counter
+
+
+@pytest.fixture
+def run_with_database(tmp_path, use_test_settings, visit_counter):
+    """Run ``scenario()`` in a fresh event loop against a new database file."""
+    settings = use_test_settings(database_url=f"sqlite+aiosqlite:///{tmp_path / 'portfolio.db'}")
+
+    def run(scenario):
+        async def main():
+            init_engines(settings)
+            try:
+                await init_database()
+                return await scenario()
+            finally:
+                await dispose_engines()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,59 @@
+"""VerifiedClaimsCache: entries live until the token's ``exp`` and no longer."""
+import asyncio
+
+import app.core.auth as auth
+from app.core.auth import VerifiedClaimsCache, verify_clerk_token
+
+NOW = 1_800_000_000.0
+
+
+def at(monkeypatch, moment: float) -> None:
+    monkeypatch.setattr(auth.time, "time", lambda: moment)
+
+
+def test_claims_are_served_until_exp(monkeypatch):
+    cache = VerifiedClaimsCache()
+    claims = {"sub": "user_1", "exp": NOW + 60}
+    cache.put("token-1", claims)
+
+    at(monkeypatch, NOW + 59.9)
+    assert cache.get("token-1") == claims
+
+    at(monkeypatch, NOW + 60)
+    assert cache.get("token-1") is None
+    assert cache.stats()["size"] == 0
+    assert cache.counters == {"hits": 1, "misses": 1, "expired": 1, "evictions": 0}
+
+
+def test_tokens_without_a_numeric_exp_are_not_cached():
+    cache = VerifiedClaimsCache()
+    cache.put("no-exp", {"sub": "user_1"})
+    cache.put("text-exp", {"sub": "user_1", "exp": "tomorrow"})
+
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    at(monkeypatch, NOW)
+    cache = VerifiedClaimsCache(max_size=2)
+    for token in ("a", "b"):
+        cache.put(token, {"sub": token, "exp": NOW + 60})
+    cache.get("a")
+    cache.put("c", {"sub": "c", "exp": NOW + 60})
+
+    assert cache.get("b") is None
+    assert cache.get("a")["sub"] == "a"
+    assert cache.get("c")["sub"] == "c"
+    assert cache.counters["evictions"] == 1
+
+
+def test_cached_claims_skip_signature_checks_until_they_expire(monkeypatch):
+    cache = VerifiedClaimsCache()
+    monkeypatch.setattr(auth, "claims_cache", cache)
+    cache.put("not-even-a-jwt", {"sub": "user_1", "exp": NOW + 60})
+
+    at(monkeypatch, NOW)
+    assert asyncio.run(verify_clerk_token("not-even-a-jwt")) == {"sub": "user_1", "exp": NOW + 60}
+
+    at(monkeypatch, NOW + 60)
+    assert asyncio.run(verify_clerk_token("not-even-a-jwt")) is None
@@ -0,0 +1,87 @@
+"""Keyset pagination of /contact/messages."""
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.core.database import Base
+from app.main import create_app
+from app.models.portfolio import ContactMessage
+
+START = datetime(2026, 5, 1, 9, 30, 0, 250000)
+
+
+def encoded(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.fixture
+def client(tmp_path, use_test_settings):
+    path = tmp_path / "portfolio.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(ContactMessage.__table__.insert(), [
+            {
+                "sender_name": f"Sender {i}",
+                "sender_email": f"sender{i}@example.com",
+                "subject": f"Message {i}",
+                "message_body": "Checking keyset pagination across pages.",
+                # Pairs of messages share a timestamp, so the id breaks the tie.
+                "created_at": START + timedelta(minutes=i // 2),
+                "is_read": i % 3 == 0
+            }
+            for i in range(7)
+        ])
+    engine.dispose()
+
+    settings = use_test_settings(
+        database_url=f"sqlite+aiosqlite:///{path}",
+        github_api_base="http://127.0.0.1:9",
+        metrics_enabled=False
+    )
+    with TestClient(create_app(settings)) as client:
+        yield client
+
+
+def read_all_pages(client: TestClient, **params) -> tuple[list[int], list[dict]]:
+    ids, pages, cursor = [], [], None
+    while True:
+        page = client.get("/api/v1/contact/messages", params={**params, "cursor": cursor} if cursor else params)
+        assert page.status_code == 200, page.text
+        body = page.json()
+        pages.append(body)
+        ids.extend(message["id"] for message in body["messages"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids, pages
+
+
+def test_cursor_walks_every_message_once_newest_first(client):
+    ids, pages = read_all_pages(client, limit=2)
+
+    assert ids == [7, 6, 5, 4, 3, 2, 1]
+    assert [page["count"] for page in pages] == [2, 2, 2, 1]
+    assert all(page["total_count"] == 7 for page in pages)
+
+
+def test_cursor_keeps_the_filter(client):
+    ids, pages = read_all_pages(client, limit=1, is_read=True)
+
+    assert ids == [7, 4, 1]
+    assert pages[0]["total_count"] == 3
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor!",
+    encoded(b"[1, 2, 3]"),
+    encoded(b'["yesterday", 4]'),
+    encoded(b'["2026-05-01T09:30:00", "four"]'),
+    encoded(b"null"),
+])
+def test_malformed_cursor_is_a_400(client, cursor):
+    response = client.get("/api/v1/contact/messages", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,95 @@
+"""ConditionalGetMiddleware: ETags, 304 Not Modified and when routes still run."""
+from fastapi import Depends, FastAPI, Header, HTTPException
+from fastapi.testclient import TestClient
+
+from app.core.http_cache import CachePolicy, ConditionalGetMiddleware, cache_control
+from app.core.versions import bump_version, data_version
+
+
+def build_app() -> tuple[FastAPI, dict[str, int]]:
+    calls = {"public": 0, "private": 0, "static": 0}
+
+    def require_token(authorization: str = Header("")) -> None:
+        if authorization != "Bearer letmein":
+            raise HTTPException(status_code=401)
+
+    app = FastAPI()
+
+    @app.get("/public")
+    def public():
+        calls["public"] += 1
+        return {"greeting": "hello"}
+
+    @app.get("/private", dependencies=[Depends(require_token)])
+    def private():
+        calls["private"] += 1
+        return {"secret": 42}
+
+    @app.get("/static")
+    def static():
+        calls["static"] += 1
+        return {"skills": ["python"]}
+
+    version = lambda: data_version("http-cache-test")
+    app.add_middleware(ConditionalGetMiddleware, policies={
+        "/public": CachePolicy(cache_control(60), version=version),
+        "/private": CachePolicy("private, no-cache", version=version),
+        "/static": CachePolicy(cache_control(3600), static=True),
+    })
+    return app, calls
+
+
+def test_matching_etag_gets_304_without_running_a_public_route():
+    app, calls = build_app()
+    client = TestClient(app)
+
+    first = client.get("/public")
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=60"
+
+    again = client.get("/public", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == first.headers["etag"]
+    assert calls["public"] == 1
+
+
+def test_etag_changes_after_a_write():
+    app, _ = build_app()
+    client = TestClient(app)
+    etag = client.get("/public").headers["etag"]
+
+    bump_version("http-cache-test")
+
+    after = client.get("/public", headers={"If-None-Match": etag})
+    assert after.status_code == 200
+    assert after.headers["etag"] != etag
+
+
+def test_private_routes_run_their_dependencies_before_a_304():
+    app, calls = build_app()
+    client = TestClient(app)
+    etag = client.get("/private", headers={"Authorization": "Bearer letmein"}).headers["etag"]
+
+    assert client.get("/private", headers={"If-None-Match": etag}).status_code == 401
+
+    authorized = client.get("/private", headers={"If-None-Match": etag, "Authorization": "Bearer letmein"})
+    assert authorized.status_code == 304
+    assert calls["private"] == 2
+
+
+def test_static_etag_is_reused_across_query_strings():
+    app, calls = build_app()
+    client = TestClient(app)
+    etag = client.get("/static").headers["etag"]
+
+    assert client.get("/static?utm_source=x", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/static", headers={"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+    assert calls["static"] == 1
+
+
+def test_error_responses_pass_through_without_caching_headers():
+    app, _ = build_app()
+    response = TestClient(app).get("/private")
+    assert response.status_code == 401
+    assert "etag" not in response.headers
@@ -0,0 +1,79 @@
+"""HyperLogLog accuracy and merging, and the per-day unique visitor sketches."""
+from datetime import date, datetime
+
+import pytest
+
+from app.core.database import AsyncSessionLocal
+from app.services.hyperloglog import HyperLogLog
+from app.services.visit_buffer import VisitEvent, VisitWriteBuffer
+from app.services.visit_counter import estimate_unique_profile_visitors, estimate_unique_visitors
+
+
+def ips(start: int, stop: int) -> list[str]:
+    return [f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(start, stop)]
+
+
+def sketch_of(values: list[str]) -> HyperLogLog:
+    sketch = HyperLogLog()
+    sketch.update(values)
+    return sketch
+
+
+@pytest.mark.parametrize("cardinality", [10, 1000, 50000])
+def test_count_stays_within_three_standard_errors(cardinality):
+    sketch = sketch_of(ips(0, cardinality))
+    error = abs(sketch.count() - cardinality) / cardinality
+    assert error <= 3 * sketch.standard_error
+
+
+def test_duplicates_are_counted_once():
+    sketch = sketch_of(ips(0, 500) * 4)
+    assert abs(sketch.count() - 500) <= 500 * 3 * sketch.standard_error
+
+
+def test_merge_matches_the_sketch_of_the_union():
+    monday, tuesday = sketch_of(ips(0, 3000)), sketch_of(ips(2000, 5000))
+    union = sketch_of(ips(0, 5000))
+
+    merged = HyperLogLog.merged([monday.to_bytes(), None, tuesday.to_bytes()])
+    monday.merge(tuesday)
+
+    assert monday.registers == union.registers
+    assert merged.registers == union.registers
+
+
+def test_serialized_sketches_round_trip():
+    sketch = sketch_of(ips(0, 800))
+    assert HyperLogLog.from_bytes(sketch.to_bytes()).registers == sketch.registers
+
+
+def test_sketches_with_different_precision_do_not_merge():
+    with pytest.raises(ValueError):
+        HyperLogLog(12).merge(HyperLogLog(10))
+    with pytest.raises(ValueError):
+        HyperLogLog.merged([HyperLogLog(12).to_bytes(), HyperLogLog(10).to_bytes()])
+
+
+def test_unique_visitors_merge_daily_sketches_per_population(run_with_database):
+    def visit(table: str, ip: str, day: int) -> VisitEvent:
+        return VisitEvent(
+            table=table, ip_address=ip, user_agent=None, referrer=None,
+            visited_at=datetime(2026, 3, day, 12)
+        )
+
+    async def scenario():
+        buffer = VisitWriteBuffer()
+        await buffer.flush(
+            [visit("visitor_logs", ip, 14) for ip in ips(0, 30)]
+            + [visit("visitor_logs", ip, 15) for ip in ips(20, 50)]
+            + [visit("profile_visitors", ip, 15) for ip in ips(100, 107)]
+        )
+        async with AsyncSessionLocal() as session:
+            return (
+                await estimate_unique_visitors(session),
+                await estimate_unique_visitors(session, start=date(2026, 3, 15)),
+                await estimate_unique_profile_visitors(session)
+            )
+
+    all_days, last_day, profile = run_with_database(scenario)
+    assert (all_days, last_day, profile) == (50, 30, 7)
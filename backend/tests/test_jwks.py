@@ -0,0 +1,146 @@
+"""JWKSManager: kid-miss refresh, negative caching and single-flight fetches."""
+import asyncio
+import base64
+
+import httpx
+import pytest
+import rsa
+
+from app.core.http import http_pool
+from app.core.jwks import JWKSManager
+
+JWKS_URL = "https://clerk.example.com/.well-known/jwks.json"
+
+_public_key, _ = rsa.newkeys(1024)
+
+
+def b64url(number: int) -> str:
+    return base64.urlsafe_b64encode(number.to_bytes((number.bit_length() + 7) // 8, "big")).decode().rstrip("=")
+
+
+def key_set(*kids: str) -> dict:
+    return {"keys": [
+        {"kty": "RSA", "kid": kid, "alg": "RS256", "n": b64url(_public_key.n), "e": b64url(_public_key.e)}
+        for kid in kids
+    ]}
+
+
+class JWKSEndpoint:
+    """In-memory JWKS endpoint that counts requests and can hold them until released."""
+
+    def __init__(self, *kids: str):
+        self.body = key_set(*kids)
+        self.status = 200
+        self.requests = 0
+        self.release: asyncio.Event | None = None
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        if self.release is not None:
+            await self.release.wait()
+        return httpx.Response(self.status, json=self.body)
+
+
+@pytest.fixture
+def run_against(use_test_settings):
+    use_test_settings()
+
+    def run(endpoint: JWKSEndpoint, scenario):
+        async def main():
+            await http_pool.start(transport=httpx.MockTransport(endpoint))
+            try:
+                return await scenario()
+            finally:
+                await http_pool.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_unknown_kid_forces_a_refresh(run_against):
+    endpoint = JWKSEndpoint("key-1")
+    manager = JWKSManager(url=JWKS_URL, min_refresh_interval=0)
+
+    async def scenario():
+        assert await manager.get_key("key-1") is not None
+        endpoint.body = key_set("key-1", "key-2")
+        return await manager.get_key("key-2")
+
+    assert run_against(endpoint, scenario) is not None
+    assert endpoint.requests == 2
+    assert manager.counters["kid_misses"] == 1
+
+
+def test_kid_miss_refreshes_are_rate_limited(run_against):
+    endpoint = JWKSEndpoint("key-1")
+    manager = JWKSManager(url=JWKS_URL, min_refresh_interval=60)
+
+    async def scenario():
+        await manager.get_key("key-1")
+        return [await manager.get_key("forged") for _ in range(3)]
+
+    assert run_against(endpoint, scenario) == [None, None, None]
+    assert endpoint.requests == 1
+    assert manager.counters["kid_misses"] == 3
+
+
+def test_failed_fetches_are_remembered_for_failure_ttl(run_against):
+    endpoint = JWKSEndpoint("key-1")
+    endpoint.status = 503
+    manager = JWKSManager(url=JWKS_URL, failure_ttl=60)
+
+    async def scenario():
+        for _ in range(3):
+            assert await manager.get_keys() == {}
+        return manager.stats()
+
+    stats = run_against(endpoint, scenario)
+    assert endpoint.requests == 1
+    assert stats["refresh_errors"] == 1
+    assert stats["negative_hits"] == 2
+    assert stats["failing"]
+
+
+def test_expired_keys_are_kept_when_the_refresh_fails(run_against):
+    endpoint = JWKSEndpoint("key-1")
+    manager = JWKSManager(url=JWKS_URL, ttl=0)
+
+    async def scenario():
+        await manager.get_keys()
+        endpoint.status = 500
+        return await manager.get_key("key-1")
+
+    assert run_against(endpoint, scenario) is not None
+    assert endpoint.requests == 2
+
+
+def test_concurrent_callers_share_one_fetch(run_against):
+    endpoint = JWKSEndpoint("key-1")
+    manager = JWKSManager(url=JWKS_URL)
+
+    async def scenario():
+        endpoint.release = asyncio.Event()
+        callers = [asyncio.create_task(manager.get_key("key-1")) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        endpoint.release.set()
+        return await asyncio.gather(*callers)
+
+    keys = run_against(endpoint, scenario)
+    assert all(key is not None for key in keys)
+    assert endpoint.requests == 1
+    assert manager.counters["coalesced"] == 4
+
+
+def test_rotated_out_keys_trigger_the_callback(run_against):
+    endpoint = JWKSEndpoint("key-1", "key-2")
+    removed = []
+    manager = JWKSManager(url=JWKS_URL, ttl=0, on_keys_removed=lambda: removed.append(True))
+
+    async def scenario():
+        await manager.get_keys()
+        endpoint.body = key_set("key-2")
+        return await manager.get_keys()
+
+    assert set(run_against(endpoint, scenario)) == {"key-2"}
+    assert removed == [True]
@@ -0,0 +1,73 @@
+"""Every budgeted route stays within its query budget on a fresh database.
+
+Budgets are enforced, so a route that issues one query too many fails the
+request with ``QueryBudgetExceededError`` instead of only logging it.
+"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import get_current_admin_required
+from app.core.identity import UserIdentity
+from app.main import create_app
+from app.services.github_cache import repo_cache
+from app.services.github_service import get_fallback_repos
+
+ADMIN = UserIdentity(id=1, clerk_id="user_admin", email="admin@example.com", name="Admin", is_admin=True)
+
+BUDGETED_REQUESTS = [
+    ("get", "/api/v1/portfolio/projects"),
+    ("get", "/api/v1/portfolio/projects?category=backend"),
+    ("get", "/api/v1/portfolio/projects/featured"),
+    ("get", "/api/v1/portfolio/stats"),
+    ("post", "/api/v1/portfolio/track-visit"),
+    ("get", "/api/v1/visitors/count"),
+    ("get", "/api/v1/visitors/stats"),
+    ("post", "/api/v1/visitors/track"),
+    ("get", "/api/v1/contact/messages"),
+    ("get", "/api/v1/contact/messages?is_read=false"),
+    ("get", "/api/v1/contact/messages/count"),
+    ("get", "/api/v1/exports/visitor-logs"),
+    ("get", "/api/v1/exports/contact-messages?format=csv"),
+]
+
+
+@pytest.fixture
+def client(tmp_path, use_test_settings):
+    settings = use_test_settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'portfolio.db'}",
+        github_api_base="http://127.0.0.1:9",
+        query_profiler=True,
+        query_budget_enforce=True,
+        metrics_enabled=False
+    )
+    app = create_app(settings)
+    app.dependency_overrides[get_current_admin_required] = lambda: ADMIN
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture(params=[False, True], ids=["no-snapshot", "unsynced-snapshot"])
+def snapshot(request):
+    """Run once with no GitHub data and once with repos loaded but not yet synced."""
+    previous = repo_cache._repos
+    repo_cache._repos = get_fallback_repos() if request.param else None
+    try:
+        yield
+    finally:
+        repo_cache._repos = previous
+
+
+@pytest.mark.parametrize("method,path", BUDGETED_REQUESTS)
+def test_budgeted_routes_fit_on_an_empty_database(client, snapshot, method, path):
+    response = getattr(client, method)(path)
+    assert response.status_code < 400, response.text
+
+
+def test_contact_submit_fits_its_budget(client):
+    response = client.post("/api/v1/contact/submit", json={
+        "sender_name": "Budget",
+        "sender_email": "budget@example.com",
+        "subject": "Query budget",
+        "message_body": "Checking that submitting stays within its budget."
+    })
+    assert response.status_code == 201, response.text
@@ -0,0 +1,115 @@
+"""Read-replica routing against two local SQLite files.
+
+The primary and the replica are separate database files, each with the
+full schema; the primary holds one contact message and the replica none,
+so a count tells which database a read session landed on.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import OperationalError
+
+from app.core.database import (
+    Base,
+    check_replica,
+    dispose_engines,
+    get_engines,
+    get_read_session,
+    init_engines,
+    replica_health,
+)
+from app.models.portfolio import ContactMessage
+
+read_session = asynccontextmanager(get_read_session)
+
+
+@pytest.fixture
+def databases(tmp_path, use_test_settings):
+    replica_dir = tmp_path / "replica"
+    replica_dir.mkdir()
+    paths = {"primary": tmp_path / "primary.db", "replica": replica_dir / "replica.db"}
+    for path in paths.values():
+        engine = create_engine(f"sqlite:///{path}")
+        Base.metadata.create_all(engine)
+        engine.dispose()
+
+    engine = create_engine(f"sqlite:///{paths['primary']}")
+    with engine.begin() as conn:
+        conn.execute(ContactMessage.__table__.insert().values(
+            sender_name="Primary",
+            sender_email="primary@example.com",
+            subject="Stored on the primary",
+            message_body="Only the primary database has this row."
+        ))
+    engine.dispose()
+
+    settings = use_test_settings(
+        database_url=f"sqlite+aiosqlite:///{paths['primary']}",
+        database_replica_url=f"sqlite+aiosqlite:///{paths['replica']}",
+        database_replica_check_interval=60.0,
+        metrics_enabled=False
+    )
+    replica_health.record_success()
+    try:
+        yield {**paths, "replica_dir": replica_dir, "settings": settings}
+    finally:
+        replica_health.record_success()
+
+
+async def count_messages() -> int:
+    async with read_session() as session:
+        return await session.scalar(select(func.count(ContactMessage.id)))
+
+
+def run(databases, scenario) -> None:
+    async def main():
+        init_engines(databases["settings"])
+        try:
+            await scenario()
+        finally:
+            await dispose_engines()
+
+    asyncio.run(main())
+
+
+def test_reads_use_the_replica(databases):
+    async def scenario():
+        assert get_engines().replica is not None
+        assert await count_messages() == 0
+        assert replica_health.healthy
+
+    run(databases, scenario)
+
+
+def test_reads_fall_back_to_primary_when_the_replica_disappears(databases):
+    async def scenario():
+        assert await count_messages() == 0
+
+        databases["replica_dir"].rename(databases["replica_dir"].with_name("replica-gone"))
+        await get_engines().replica.dispose()
+
+        with pytest.raises(OperationalError):
+            await count_messages()
+        assert not replica_health.healthy
+        assert await count_messages() == 1
+
+    run(databases, scenario)
+
+
+def test_check_replica_restores_the_replica(databases):
+    async def scenario():
+        gone = databases["replica_dir"].with_name("replica-gone")
+        databases["replica_dir"].rename(gone)
+        await get_engines().replica.dispose()
+
+        assert not await check_replica()
+        assert await count_messages() == 1
+
+        gone.rename(databases["replica_dir"])
+        assert await check_replica()
+        assert replica_health.healthy
+        assert await count_messages() == 0
+
+    run(databases, scenario)
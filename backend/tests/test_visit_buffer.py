@@ -0,0 +1,123 @@
+"""VisitWriteBuffer overflow policies, flush retries and draining on stop."""
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.portfolio import VisitorLog
+from app.models.user import ProfileVisitor
+from app.services.visit_buffer import VisitEvent, VisitWriteBuffer
+
+
+def visit(page: str, table: str = "visitor_logs") -> VisitEvent:
+    return VisitEvent(table=table, ip_address="203.0.113.7", user_agent="pytest", referrer=None, page_visited=page)
+
+
+class RecordingBuffer(VisitWriteBuffer):
+    """Records flushed events instead of writing them; fails the first ``failures`` flushes."""
+
+    def __init__(self, failures: int = 0, gate: asyncio.Event | None = None, **options):
+        super().__init__(**options)
+        self.failures = failures
+        self.gate = gate
+        self.flushed: list[str] = []
+
+    async def flush(self, events: list[VisitEvent]) -> bool:
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.flushed.extend(event.page_visited for event in events)
+        return True
+
+
+def test_drop_newest_rejects_events_once_full():
+    async def scenario():
+        buffer = RecordingBuffer(max_size=2, flush_interval=60, overflow_policy="drop_newest")
+        await buffer.start()
+        accepted = [await buffer.submit(visit(page)) for page in ("/a", "/b", "/c")]
+        await buffer.stop()
+        return accepted, buffer
+
+    accepted, buffer = asyncio.run(scenario())
+    assert accepted == [True, True, False]
+    assert buffer.flushed == ["/a", "/b"]
+    assert buffer.counters["dropped"] == 1
+
+
+def test_drop_oldest_makes_room_for_new_events():
+    async def scenario():
+        buffer = RecordingBuffer(max_size=2, flush_interval=60, overflow_policy="drop_oldest")
+        await buffer.start()
+        accepted = [await buffer.submit(visit(page)) for page in ("/a", "/b", "/c")]
+        await buffer.stop()
+        return accepted, buffer
+
+    accepted, buffer = asyncio.run(scenario())
+    assert accepted == [True, True, True]
+    assert buffer.flushed == ["/b", "/c"]
+    assert buffer.counters["dropped"] == 1
+
+
+def test_block_waits_for_room_instead_of_dropping():
+    async def scenario():
+        gate = asyncio.Event()
+        buffer = RecordingBuffer(gate=gate, max_size=1, batch_size=1, flush_interval=60, overflow_policy="block")
+        await buffer.start()
+        await buffer.submit(visit("/a"))
+        for _ in range(3):
+            await asyncio.sleep(0)  # the flusher takes /a and waits on the gate
+        await buffer.submit(visit("/b"))
+
+        blocked = asyncio.create_task(buffer.submit(visit("/c")))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert not blocked.done()
+
+        gate.set()
+        assert await blocked
+        await buffer.stop()
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    assert buffer.flushed == ["/a", "/b", "/c"]
+    assert buffer.counters["dropped"] == 0
+
+
+def test_flush_with_retry_recovers_from_transient_failures():
+    buffer = RecordingBuffer(failures=2, max_retries=3, retry_backoff=0)
+
+    assert asyncio.run(buffer.flush_with_retry([visit("/a"), visit("/b")]))
+    assert buffer.flushed == ["/a", "/b"]
+    assert buffer.counters["flush_retries"] == 2
+    assert buffer.counters["dropped"] == 0
+
+
+def test_flush_with_retry_drops_the_batch_after_max_retries():
+    buffer = RecordingBuffer(failures=10, max_retries=2, retry_backoff=0)
+
+    assert not asyncio.run(buffer.flush_with_retry([visit("/a"), visit("/b")]))
+    assert buffer.flushed == []
+    assert buffer.counters["flush_retries"] == 2
+    assert buffer.counters["dropped"] == 2
+
+
+def test_stop_drains_queued_events_into_the_database(run_with_database):
+    async def scenario():
+        buffer = VisitWriteBuffer(batch_size=2, flush_interval=60)
+        await buffer.start()
+        for page in ("/a", "/b", "/c", "/d", "/e"):
+            await buffer.submit(visit(page))
+        await buffer.submit(visit("/profile", table="profile_visitors"))
+        await buffer.stop()
+
+        async with AsyncSessionLocal() as session:
+            logs = await session.scalar(select(func.count(VisitorLog.id)))
+            profile = await session.scalar(select(func.count(ProfileVisitor.id)))
+        return buffer, logs, profile
+
+    buffer, logs, profile = run_with_database(scenario)
+    assert (logs, profile) == (5, 1)
+    assert buffer.counters["flushed"] == 6
+    assert not buffer.running
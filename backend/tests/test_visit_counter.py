@@ -0,0 +1,64 @@
+"""DailyVisitCounter: atomic ``visit_count + n`` upserts into visitor_stats."""
+from datetime import date
+
+from sqlalchemy import insert, select
+
+from app.core.database import AsyncSessionLocal
+from app.models.portfolio import VisitorStats
+from app.services.visit_counter import ALL_TIME
+
+DAY = date(2026, 3, 14)
+
+
+async def apply_pending(counter):
+    async with AsyncSessionLocal() as session:
+        counts, totals = await counter.apply(session, counter.take_pending())
+        await session.commit()
+    counter.mark_persisted(counts, totals)
+    return counts, totals
+
+
+async def stored_count(day: date) -> int:
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(VisitorStats.visit_count).where(VisitorStats.visit_date == day))
+
+
+def test_apply_creates_the_row_then_adds_to_it(run_with_database, visit_counter):
+    async def scenario():
+        visit_counter.increment(DAY, amount=3)
+        first = await apply_pending(visit_counter)
+        visit_counter.increment(DAY)
+        visit_counter.increment(DAY, amount=3)
+        second = await apply_pending(visit_counter)
+        return first, second, await stored_count(DAY)
+
+    first, second, stored = run_with_database(scenario)
+    assert first[0] == {DAY: 3}
+    assert second[0] == {DAY: 7}
+    assert second[1][ALL_TIME] == 7
+    assert stored == 7
+
+
+def test_apply_adds_to_counts_written_elsewhere(run_with_database, visit_counter):
+    async def scenario():
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert(VisitorStats).values(visit_date=DAY, visit_count=10, unique_visitors=0))
+            await session.commit()
+
+        visit_counter.increment(DAY, amount=2)
+        counts, _ = await apply_pending(visit_counter)
+        return counts, await stored_count(DAY)
+
+    counts, stored = run_with_database(scenario)
+    assert counts == {DAY: 12}
+    assert stored == 12
+
+
+def test_pending_increments_are_kept_until_applied(visit_counter):
+    visit_counter.increment(DAY, amount=2)
+    pending = visit_counter.take_pending()
+    assert visit_counter.count(DAY) == 0
+
+    visit_counter.restore(pending)
+    visit_counter.increment(DAY)
+    assert visit_counter.take_pending() == {DAY: 3}
@@ -0,0 +1,29 @@
+"""/visitors/count and /visitors/stats served from the rollups and daily rows."""
+from datetime import datetime
+
+from fastapi.testclient import TestClient
+
+from app.main import create_app
+
+
+def test_tracked_visits_show_up_in_count_and_stats(tmp_path, use_test_settings):
+    settings = use_test_settings(
+        database_url=f"sqlite+aiosqlite:///{tmp_path / 'portfolio.db'}",
+        github_api_base="http://127.0.0.1:9",
+        metrics_enabled=False
+    )
+    app = create_app(settings)
+
+    with TestClient(app) as client:
+        for expected in (1, 2, 3):
+            assert client.post("/api/v1/visitors/track").json()["today_count"] == expected
+        assert client.get("/api/v1/visitors/count").json() == {"total_visitors": 3, "today_visitors": 3}
+
+    # Shutting down drained the buffered visits; a restart serves them from the database.
+    with TestClient(app) as client:
+        stats = client.get("/api/v1/visitors/stats").json()
+
+    today = datetime.utcnow().date()
+    assert stats["total_all_time"] == stats["total_this_year"] == stats["total_this_month"] == 3
+    assert stats["unique_visitors"] == 1
+    assert stats["daily_stats"] == [{"date": today.isoformat(), "count": 3, "unique": 1}]
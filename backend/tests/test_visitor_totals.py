@@ -0,0 +1,54 @@
+"""Reconciling the visitor_totals rollups against their source tables."""
+from datetime import date
+
+from sqlalchemy import delete, select, update
+
+from app.core.database import AsyncSessionLocal
+from app.models.portfolio import VisitorTotal
+from app.services.visit_buffer import VisitEvent, VisitWriteBuffer
+from app.services.visit_counter import ALL_TIME, PROFILE_VISITS, reconcile_visitor_totals
+
+
+async def record_visits(counter) -> None:
+    for day, amount in ((date(2025, 12, 31), 2), (date(2026, 1, 1), 3)):
+        counter.increment(day, amount=amount)
+    await VisitWriteBuffer().flush([
+        VisitEvent(table="profile_visitors", ip_address="198.51.100.1", user_agent=None, referrer=None)
+    ])
+
+
+async def stored_totals() -> dict[str, int]:
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(VisitorTotal.period, VisitorTotal.total))
+        return dict(result.all())
+
+
+def test_reconcile_leaves_consistent_totals_alone(run_with_database, visit_counter):
+    async def scenario():
+        await record_visits(visit_counter)
+        return await reconcile_visitor_totals(), await stored_totals()
+
+    mismatches, totals = run_with_database(scenario)
+    assert mismatches == {}
+    assert totals[ALL_TIME] == 5
+    assert (totals["2025"], totals["2025-12"], totals["2026"], totals["2026-01"]) == (2, 2, 3, 3)
+    assert totals[PROFILE_VISITS] == 1
+
+
+def test_reconcile_corrects_drifted_and_missing_totals(run_with_database, visit_counter):
+    async def scenario():
+        await record_visits(visit_counter)
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(VisitorTotal).where(VisitorTotal.period == ALL_TIME).values(total=42))
+            await session.execute(update(VisitorTotal).where(VisitorTotal.period == PROFILE_VISITS).values(total=0))
+            await session.execute(delete(VisitorTotal).where(VisitorTotal.period == "2026-01"))
+            await session.commit()
+
+        mismatches = await reconcile_visitor_totals()
+        return mismatches, await stored_totals()
+
+    mismatches, totals = run_with_database(scenario)
+    assert mismatches == {ALL_TIME: (42, 5), PROFILE_VISITS: (0, 1), "2026-01": (0, 3)}
+    assert (totals[ALL_TIME], totals[PROFILE_VISITS], totals["2026-01"]) == (5, 1, 3)
+    assert visit_counter.total() == 5
+    assert visit_counter.total("2026-01") == 3